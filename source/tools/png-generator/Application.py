@@ -1,41 +1,79 @@
-import os
 import random
 import sys
-from pydoc import locate
+
+import numpy as np
 
 from Arguments import Arguments
 from Image import Image
+from TiledImage import TiledImage
+from Dataset import Dataset
+from MaskAtlas import MaskAtlas
+from encoders.PyPng import PyPng
+from encoders.Zlib import Zlib
+from rasterizers.Numpy import Numpy
+from rasterizers.Shapely import Shapely
+from rasterizers.ShapelyVectorized import ShapelyVectorized
 from BoundingBox import BoundingBox
+from DashedBorder import DashedBorder
 from PolyRect import PolyRect
+from Registry import Registry
 from colors.Flat import Flat
-from forms.Plus import Plus
-from forms.Cross import Cross
+from colors.Gradient import Gradient
+from forms.Form import Form
+from forms.MaskCache import MaskCache
+from forms.PolygonForm import PolygonForm
+from forms.Spans import Spans
 from Meta import Meta
 from Color import Color
+from ColorSampler import ColorSampler
+from ColorSetup import ColorSetup
 from datetime import datetime
+from timeit import default_timer
 
 class Application:
     def __init__(self):
-        self.forms = {}
         self.formBlacklist = [
             "Form",
-            "PolygonForm"
+            "PolygonForm",
+            "MaskCache",
+            "Spans"
         ]
+        self.forms = Registry("forms", "png_generator.forms", self.formBlacklist, self.prepareForm)
+        self.disabledForms = set()
 
-        self.colors = {}
         self.colorBlacklist = [
             "ColorGenerator",
             "Gradient"
         ]
+        self.colors = Registry("colors", "png_generator.colors", self.colorBlacklist, self.prepareColor)
+        self.disabledColors = set()
 
         self.tests = {}
 
+        self.backgroundTemplates = {}
+        self.backgroundTemplateLimit = 8
+
         self.metaClass = Meta
 
         self.args = None
         self.arguments = Arguments()
+        self.dataset = None
+        self.encoder = None
+
+        self.backgroundSampler = None
+        self.boundingBoxFillSampler = None
+        self.boundingBoxBorderSampler = None
+        self.colorSetup = None
+        self.colorSetupSource = None
+        self.gradientSetup = None
+        self.backgroundColor = None
+        self.pickerColorCount = 5
 
         self.addTest("overlapping", self.testOverlapping, "Tests the bounding box is overlapping functionality.")
+        self.addTest("rasterizers", self.testRasterizers, "Compares the masks of all available polygon rasterizers with the shapely reference for every size from --min-size to --max-size.")
+        self.addTest("meta", self.testMeta, "Compares the overlapping test of the grid of the meta data with the test of every entry for random bounding boxes.")
+        self.addTest("shading", self.testShading, "Compares the colors of all color generators, that are shaded at once, with the colors of single pixels in every color mode.")
+        self.addTest("distance-field", self.testDistanceField, "Compares the masks resampled from the signed distance field with the masks rasterized from the geometry of every form for every size from --min-size to --max-size and the aspect ratios 1, 1/2 and 2.")
 
     def parseArguments(self, arguments=None):
         tests = [(name, self.tests[name][1]) for name in self.tests.keys()]
@@ -53,34 +91,25 @@ class Application:
             self.formBlacklist.append(name)
 
     def addForm(self, name, form):
-        if name not in self.formBlacklist:
-            self.info(f"Loaded form {name}")
-            self.forms[name] = form()
+        if self.forms.add(name, lambda: form):
+            self.info(f"Added form {name}")
 
     def scanForms(self):
-        for file in os.listdir("./forms"):
-            if file.endswith(".py"):
-                name = Application.replaceLast(file, ".py", "")
-                locateString = "forms." + name + "." + name
-                classVar = locate(locateString)
-                self.addForm(name, classVar)
+        # the modules of the forms are imported, when a form is used for the first time
+        for name in self.forms.scan():
+            self.info(f"Found form {name}")
 
     def blacklistColor(self, name):
         if name not in self.colorBlacklist:
             self.colorBlacklist.append(name)
 
     def addColor(self, name, generator):
-        if name not in self.colorBlacklist:
-            self.info(f"Loaded color generator {name}")
-            self.colors[name] = generator()
+        if self.colors.add(name, lambda: generator):
+            self.info(f"Added color generator {name}")
 
     def scanColors(self):
-        for file in os.listdir("./colors"):
-            if file.endswith(".py"):
-                name = Application.replaceLast(file, ".py", "")
-                locateString = "colors." + name + "." + name
-                classVar = locate(locateString)
-                self.addColor(name, classVar)
+        for name in self.colors.scan():
+            self.info(f"Found color generator {name}")
 
     def generateName(self):
         # generates a filename <YYYY><MM><DD>-<Counter>
@@ -90,62 +119,88 @@ class Application:
         return f"{timeStr}-{self.current:02d}.png"
 
     def selectRandomForm(self):
-        formName = None
-        form = None
-        found = False
-
-        # @todo Build check, that at least one form is available
+        formNames = [name for name in self.forms.keys() if name not in self.disabledForms]
+        if len(formNames) == 0:
+            raise ValueError("All forms are disabled")
 
-        while not found:
-            pos = random.randint(0, len(self.forms)-1)
-            formName = list(self.forms.keys())[pos]
-            form = self.forms[formName]
-            found = form.isEnabled
-
-        return formName, form
+        formName = formNames[random.randint(0, len(formNames)-1)]
+        return formName, self.forms[formName]
 
     def selectRandomGenerator(self):
-        generator = None
-        found = False
-
-        # @todo Build check, that at least one generator is available
+        names = [name for name in self.colors.keys() if name not in self.disabledColors]
+        if len(names) == 0:
+            raise ValueError("All color generators are disabled")
 
-        while not found:
-            pos = random.randint(0, len(self.colors)-1)
-            name = list(self.colors.keys())[pos]
-            generator = self.colors[name]
-            found = generator.isEnabled
-
-        return generator
+        return self.colors[names[random.randint(0, len(names)-1)]]
 
-    def parseColor(self, colorStr, source):
+    def compileColor(self, colorStr, source):
         if colorStr is None:
             return None
 
-        color = Color.FromString(colorStr, self.parseColorMode())
-        if color is None:
-            raise ValueError(f"Error in parsing {source}")
-
-        return color
+        try:
+            return ColorSampler.Compile(colorStr, self.parseColorMode())
+        except (AssertionError, IndexError, ValueError) as e:
+            raise ValueError(f"Error in parsing {source}: {e}")
+
+    def compileColorSetup(self, setupStr, source, colorMode, objectCount=1):
+        try:
+            return ColorSetup.Parse(setupStr, colorMode, objectCount)
+        except (AssertionError, IndexError, ValueError) as e:
+            raise ValueError(f"Error in parsing {source}: {e}")
+
+    def compileColors(self):
+        # Color specifications are parsed once, afterwards colors are drawn from the samplers
+        colorMode = self.parseColorMode()
+        if colorMode == Color.Mode.MONOCHROME:
+            self.colorSetup = self.compileColorSetup(self.args.monochrome, "--monochrome", colorMode)
+        elif colorMode == Color.Mode.GREYSCALE:
+            self.colorSetup = self.compileColorSetup(self.args.greyscale, "--greyscale", colorMode)
+        else:
+            self.colorSetup = self.compileColorSetup(self.args.rgb, "--rgb", colorMode)
+
+        if colorMode == Color.Mode.RGB:
+            self.gradientSetup = self.compileColorSetup(self.args.gradient, "--gradient", colorMode, 2)
+        else:
+            # Gradients blend between two object colors of the color setup
+            objectSampler = self.colorSetup.objects[0]
+            self.gradientSetup = ColorSetup(self.colorSetup.background, [objectSampler, objectSampler], self.colorSetup.distance, 0)
+
+        self.backgroundSampler = self.colorSetup.background
+        if self.args.background_color is not None:
+            self.backgroundSampler = self.compileColor(self.args.background_color, "--background-color")
+
+        self.colorSetupSource = {
+            Color.Mode.MONOCHROME: "--monochrome",
+            Color.Mode.GREYSCALE: "--greyscale",
+            Color.Mode.RGB: "--rgb"
+        }[colorMode]
+
+        self.boundingBoxFillSampler = self.compileColor(self.args.bounding_box_fill, "--bounding-box-fill")
+        self.boundingBoxBorderSampler = self.compileColor(self.args.bounding_box_border, "--bounding-box-border")
 
     def generateBoundingBox(self, offset, object_size):
-        backgroundColor = self.parseColor(self.args.bounding_box_fill, "--bounding-box-fill")
-        borderColor = self.parseColor(self.args.bounding_box_border, "--bounding-box-border")
-
         boundingBox = BoundingBox(offset, object_size)
 
-        if backgroundColor is not None:
-            boundingBox.setBackgroundColor(backgroundColor)
+        if self.boundingBoxFillSampler is not None:
+            boundingBox.setBackgroundColor(self.boundingBoxFillSampler.get())
 
-        if borderColor is not None:
-            boundingBox.setBorderColor(borderColor)
+        if self.boundingBoxBorderSampler is not None:
+            boundingBox.setBorderColor(self.boundingBoxBorderSampler.get())
 
         return boundingBox
 
     def generateObjectGenerator(self):
         generator = self.selectRandomGenerator()
         generator.reset()
-        for color in [Color(255, 0, 0), Color(0, 0, 255), Color(0, 255, 0), Color(255, 0, 255), Color(0, 255, 255)]:
+
+        # Object colors keep the minimum distance of the color setup to the background of the image
+        colorsRequired = generator.colorsRequired()
+        if colorsRequired == 2:
+            colors = self.gradientSetup.sampleObjects(self.backgroundColor)
+        else:
+            colors = self.colorSetup.sampleObjects(self.backgroundColor, colorsRequired if colorsRequired > 0 else self.pickerColorCount)
+
+        for color in colors:
             self.debug(f"Adding color {color}", self.args.debug_generation)
             generator.addColor(color)
 
@@ -160,17 +215,35 @@ class Application:
 
         self.debug(f"Object size is set to {object_size}", self.args.debug_generation)
 
+        # the parameters are rounded, so transformed masks can be cached
+        rotation = self.randomParameter(self.args.min_rotation, self.args.max_rotation, 0)
+        aspect = self.randomParameter(self.args.min_aspect, self.args.max_aspect, 2)
+        shear = self.randomParameter(self.args.min_shear, self.args.max_shear, 2)
+
+        # the transformed object fits into the square of the object size
+        form_size = Form.fitSize(object_size, aspect, rotation, shear)
+        extent = Form.transformedExtent(form_size, rotation, shear)
+        self.debug(f"Object transform is rotation {rotation}, aspect {aspect}, shear {shear}, extent {extent}", self.args.debug_generation)
+
         offset = (
-            random.randint(self.args.margin, image.width - (self.args.margin + object_size)),
-            random.randint(self.args.margin, image.height - (self.args.margin + object_size))
+            random.randint(self.args.margin, image.width - (self.args.margin + extent[0])),
+            random.randint(self.args.margin, image.height - (self.args.margin + extent[1]))
         )
 
         self.debug(f"Offset is {offset}", self.args.debug_generation)
 
         formInfo = self.selectRandomForm()
-        formInfo[1].setSize(object_size)
+        formInfo[1].setSize(form_size)
+        formInfo[1].setTransform(rotation, shear)
+
+        return offset, formInfo, self.generateObjectGenerator(), self.generateBoundingBox(offset, extent)
 
-        return offset, formInfo, self.generateObjectGenerator(), self.generateBoundingBox(offset, object_size)
+    @staticmethod
+    def randomParameter(minimum, maximum, digits):
+        if minimum == maximum:
+            return minimum
+
+        return round(random.uniform(minimum, maximum), digits)
 
     def parseColorMode(self):
         colorModes = {
@@ -185,10 +258,33 @@ class Application:
 
         return colorMode
 
+    def createImage(self, backgroundColor):
+        colorMode = self.parseColorMode()
+        if self.args.band_height is not None:
+            return TiledImage(self.args.width, self.args.height, colorMode, backgroundColor, self.args.band_height)
+
+        # Random backgrounds would miss the cache for almost every image, a direct fill is cheaper than a template
+        if not np.array_equal(self.backgroundSampler.minimum, self.backgroundSampler.maximum):
+            return Image(self.args.width, self.args.height, colorMode, backgroundColor)
+
+        # Images with the same size, color mode and background only differ by their objects,
+        # so every image starts as a copy of a cached background template
+        key = (self.args.width, self.args.height, colorMode, backgroundColor.r, backgroundColor.g, backgroundColor.b)
+
+        template = self.backgroundTemplates.get(key)
+        if template is None:
+            if len(self.backgroundTemplates) >= self.backgroundTemplateLimit:
+                del self.backgroundTemplates[next(iter(self.backgroundTemplates))]
+
+            template = Image(self.args.width, self.args.height, colorMode, backgroundColor)
+            self.backgroundTemplates[key] = template
+
+        return template.copy()
+
     def generateImage(self):
         # generates every required image and saves it
-        backgroundColor = self.parseColor(self.args.background_color, "--background-color")
-        image = Image(self.args.width, self.args.height, self.parseColorMode(), backgroundColor)
+        self.backgroundColor = self.backgroundSampler.get()
+        image = self.createImage(self.backgroundColor)
         self.debug(f"Image {image} created", self.args.debug_generation)
 
         meta = self.metaClass()
@@ -224,39 +320,145 @@ class Application:
             current_object += 1
             self.info(f"Object {current_object} of {object_count} generated", self.args.verbose_object)
 
+        if self.dataset is not None:
+            self.dataset.write(self.current, image, meta)
+            return
+
         name = self.generateName()
-        image.save(name)
+        image.save(name, self.encoder)
         meta.save(name)
 
+    def createEncoder(self):
+        encoders = {
+            "pypng": PyPng,
+            "zlib": Zlib
+        }
+
+        encoder = encoders.get(self.args.png_encoder)
+        if encoder is None:
+            raise ValueError(f"Unknown PNG encoder {self.args.png_encoder}")
+
+        return encoder(self.args.png_compression, self.args.png_filter)
+
+    def createRasterizer(self):
+        # auto picks the first available backend in this order
+        rasterizers = {
+            "numpy": Numpy,
+            "shapely-vectorized": ShapelyVectorized,
+            "shapely": Shapely
+        }
+
+        if self.args.rasterizer == "auto":
+            return next(rasterizer() for rasterizer in rasterizers.values() if rasterizer.available())
+
+        rasterizer = rasterizers.get(self.args.rasterizer)
+        if rasterizer is None:
+            raise ValueError(f"Unknown rasterizer {self.args.rasterizer}")
+
+        if not rasterizer.available():
+            self.error(f"Rasterizer {self.args.rasterizer} is not available, using numpy")
+            return Numpy()
+
+        return rasterizer()
+
     def prepareGeneration(self):
         # Convert self.args to dictionary to support [] operator
         args = vars(self.args)
 
-        # Prepare Forms!
-        for formName in self.forms.keys():
-            form = self.forms[formName]
+        # the dataset stores whole images, but tiled images only hold one band at once
+        if self.args.dataset is not None and self.args.band_height is not None:
+            self.arguments.parser.error("--dataset can't be combined with --band-height")
+
+        self.encoder = self.createEncoder()
+        PolygonForm.rasterizer = self.createRasterizer()
+        self.debug(f"Rasterizer {PolygonForm.rasterizer.name}", self.args.debug_generation)
+        MaskCache.shared().memoryLimit = self.args.mask_cache_size * 1024 * 1024
+        MaskCache.shared().atlas = None
+        if self.args.mask_atlas is not None:
+            MaskCache.shared().atlas = MaskAtlas(self.args.mask_atlas)
+            self.info(f"Loaded {MaskCache.shared().atlas}")
+        self.compileColors()
+
+        # Forms and generators are prepared, when they are loaded, the disabled ones are never loaded by the
+        # registries. Rectangle is always imported, it is the background of the bounding boxes.
+        self.disabledForms = {name for name in self.forms.keys() if args[f"{name.lower()}_disable"]}
+        for formName, form in self.forms.loaded():
+            self.prepareForm(formName, form)
+
+        self.disabledColors = {name for name in self.colors.keys() if args[f"{name.lower()}_disable"]}
+        for generatorName, generator in self.colors.loaded():
+            self.prepareColor(generatorName, generator)
+
+        self.checkColorDistances()
+
+    def checkColorDistances(self):
+        # Every background color has to leave object colors, that keep the distance of the color setups,
+        # otherwise the generation would fail, when the background is drawn
+        setups = [(self.colorSetup, self.colorSetupSource)]
+        if any(self.colors[name].colorsRequired() == 2 for name in self.colors.keys() if name not in self.disabledColors):
+            setups.append((self.gradientSetup, "--gradient"))
+
+        background = "--background-color" if self.args.background_color is not None else self.colorSetupSource
+        for setup, source in setups:
+            for sampler in setup.objects:
+                if not ColorSampler.KeepsDistance(self.backgroundSampler, sampler, setup.distance):
+                    self.arguments.parser.error(f"The background colors of {background} leave no object color of {source} "
+                                                f"in range {sampler.minimum.tolist()} to {sampler.maximum.tolist()}, "
+                                                f"that keeps the distance of {setup.distance}")
+
+            if len(setup.objects) < 2:
+                continue
+
+            # the object colors of a setup, like the endpoints of a gradient, also keep a distance to each other
+            for index, first in enumerate(setup.objects):
+                for second in setup.objects[index + 1:]:
+                    if ColorSampler.FarthestDistance(first, second) < setup.objectDistance:
+                        self.arguments.parser.error(f"The object colors of {source} in range {first.minimum.tolist()} to {first.maximum.tolist()} "
+                                                    f"and in range {second.minimum.tolist()} to {second.maximum.tolist()} can't keep the "
+                                                    f"distance of {setup.objectDistance} to each other")
+
+            # both distances together are checked on the lattices, that the colors are drawn from in the worst case
+            for color in ColorSampler.Lattice(self.backgroundSampler, 2 ** 6):
+                if len(ColorSampler.DistantCandidates(setup.objects, [color], setup.distance, setup.objectDistance)) == 0:
+                    self.arguments.parser.error(f"The background color {color.tolist()} of {background} leaves no object colors of {source}, "
+                                                f"that keep the distance of {setup.distance} to it and of {setup.objectDistance} to each other")
+
+    def prepareForm(self, formName, form):
+        if self.args is None:
+            return
 
-            if args[f"{formName.lower()}_disable"]:
-                self.debug(f"Form {formName} disabled", self.args.debug_generation)
-                form.disable()
-            else:
-                self.debug(f"Form {formName} enabled", self.args.debug_generation)
-                form.enable()
+        args = vars(self.args)
+        self.debug(f"Loaded form {formName}", self.args.debug_generation)
 
-            form.renderBoundingBox = self.args.render_bounding_box or args[f"{formName.lower()}_bounding_box"]
-            if form.renderBoundingBox:
-                self.debug(f"Bounding box for {formName} enabled", self.args.debug_generation)
+        if formName in self.disabledForms:
+            self.debug(f"Form {formName} disabled", self.args.debug_generation)
+            form.disable()
+        else:
+            self.debug(f"Form {formName} enabled", self.args.debug_generation)
+            form.enable()
+
+        form.antiAliasing = self.args.anti_aliasing
+        form.distanceField = self.args.distance_field
 
-        # Prepare Generators
-        for generatorName in self.colors.keys():
-            generator = self.colors[generatorName]
+        form.renderBoundingBox = self.args.render_bounding_box or args[f"{formName.lower()}_bounding_box"]
+        if form.renderBoundingBox:
+            self.debug(f"Bounding box for {formName} enabled", self.args.debug_generation)
+
+    def prepareColor(self, generatorName, generator):
+        if self.args is None:
+            return
 
-            if args[f"{generatorName.lower()}_disable"]:
-                self.debug(f"Color generator {generatorName} enabled", self.args.debug_generation)
-                generator.disable()
-            else:
-                self.debug(f"Color generator {generatorName} disabled", self.args.debug_generation)
-                generator.enable()
+        self.debug(f"Loaded color generator {generatorName}", self.args.debug_generation)
+
+        if isinstance(generator, Gradient):
+            generator.tableSize = self.args.gradient_lut
+
+        if generatorName in self.disabledColors:
+            self.debug(f"Color generator {generatorName} disabled", self.args.debug_generation)
+            generator.disable()
+        else:
+            self.debug(f"Color generator {generatorName} enabled", self.args.debug_generation)
+            generator.enable()
 
     def generate(self):
         self.info("Preparing image generation")
@@ -266,10 +468,53 @@ class Application:
             self.info("Tests executed")
             return
 
+        if self.args.build_mask_atlas is not None:
+            self.buildMaskAtlas()
+            return
+
+        if self.args.dataset is not None:
+            self.openDataset()
+
         for self.current in range(self.args.count):
             self.info(f"Image {self.current+1} of {self.args.count}")
             self.generateImage()
 
+        self.debug(f"{MaskCache.shared()}", self.args.debug_generation)
+
+        if self.dataset is not None:
+            self.dataset.close()
+            self.dataset = None
+
+    def buildMaskAtlas(self):
+        forms = list(self.forms.values()) + [DashedBorder()]
+
+        minSize = self.args.min_size if self.args.size is None else self.args.size
+        maxSize = self.args.max_size if self.args.size is None else self.args.size
+
+        masks = {}
+        for form in forms:
+            antiAliasing = form.antiAliasing
+            for enabled in (False, True):
+                form.antiAliasing = enabled
+                for size in range(minSize, maxSize + 1):
+                    form.setSize(size)
+                    masks[form.cacheKey()] = form.rasterize()
+
+            form.antiAliasing = antiAliasing
+            self.debug(f"Rendered {type(form).__name__} masks", self.args.debug_generation)
+
+        MaskAtlas.Write(self.args.build_mask_atlas, masks)
+        self.info(f"Wrote {len(masks)} masks to {self.args.build_mask_atlas}")
+
+    def openDataset(self):
+        maxObjects = self.args.object_count
+        if maxObjects is None:
+            maxObjects = self.args.max_object_count
+
+        imageShape = Image.bufferShape(self.args.width, self.args.height, self.parseColorMode())
+        self.info(f"Writing dataset {self.args.dataset}")
+        self.dataset = Dataset(self.args.dataset, self.args.count, imageShape, maxObjects, self.forms.keys())
+
     def runTests(self):
         args = vars(self.args)
         testsPerformed = 0
@@ -300,6 +545,10 @@ class Application:
         return boundingBox
 
     def testOverlapping(self):
+        # the forms are imported here, so disabled forms are not imported by the generation
+        from forms.Plus import Plus
+        from forms.Cross import Cross
+
         image = Image()
         plus = self.testOverlappingAddObject(image, formClass=Plus, offset=(40, 40), size=60, color=Color(255, 0, 0))
         cross = self.testOverlappingAddObject(image, formClass=Cross, offset=(60, 60), size=20, color=Color(0, 255, 0))
@@ -307,10 +556,222 @@ class Application:
 
         print(cross.isOverlapping(plus), plus.isOverlapping(cross))
 
+    def testMeta(self):
+        seeded = random.Random(0)
+        mismatches = 0
+        tests = 0
+        gridTime = 0.0
+        entriesTime = 0.0
+
+        # positions and sizes near multiples of the cell size test the borders of the cells, the positions may be
+        # negative, like objects, which are partially outside of the image
+        def coordinate(count):
+            return seeded.randint(-count, count) * Meta.cellSize // 2 + seeded.choice((-1, 0, 0, 1, seeded.randint(0, Meta.cellSize)))
+
+        for _ in range(100):
+            meta = self.metaClass()
+            for current in range(100):
+                position = (coordinate(10), coordinate(10))
+                size = (max(1, abs(coordinate(3))), max(1, abs(coordinate(3))))
+                boundingBox = BoundingBox(position, size)
+
+                start = default_timer()
+                overlapping = meta.isOverlapping(boundingBox)
+                gridTime += default_timer() - start
+
+                start = default_timer()
+                expected = any(boundingBox.isOverlapping(entry.boundingBox) for entry in meta.entries)
+                entriesTime += default_timer() - start
+
+                tests += 1
+                if overlapping != expected:
+                    mismatches += 1
+                    self.error(f"{boundingBox}: the grid returns overlapping {overlapping}, the entries return {expected}")
+
+                # overlapping entries are kept too, so some cells are crowded
+                meta.addEntry(self.metaClass.Entry("Rectangle", current, boundingBox))
+
+        print(f"grid {gridTime:.3f}s, entries {entriesTime:.3f}s, {mismatches} of {tests} tests mismatching")
+
+    def testRasterizers(self):
+        rasterizers = [rasterizer() for rasterizer in (Shapely, ShapelyVectorized, Numpy) if rasterizer.available()]
+        if len(rasterizers) == 0 or rasterizers[0].name != "shapely":
+            self.error("The rasterizer test requires shapely as reference")
+            return
+
+        forms = [(name, form) for name, form in self.forms.items() if isinstance(form, PolygonForm)]
+        forms.append(("DashedBorder", DashedBorder()))
+
+        minSize = self.args.min_size if self.args.size is None else self.args.size
+        maxSize = self.args.max_size if self.args.size is None else self.args.size
+
+        for formName, form in forms:
+            # besides the backends the own rasterization of the form is compared, like the spans of rectangles
+            methods = [(rasterizer.name, rasterizer.inside) for rasterizer in rasterizers]
+            if not form.antiAliasing:
+                methods.append(("form", lambda templates, width, height: Application.denseMask(form.rasterize())))
+
+            times = {name: 0.0 for name, _ in methods}
+            mismatches = {name: 0 for name, _ in methods}
+
+            for size in range(minSize, maxSize + 1):
+                form.setSize(size)
+                templates = form.templates()
+                reference = None
+
+                for name, inside in methods:
+                    start = default_timer()
+                    mask = inside(templates, form.getWidth, form.getHeight)
+                    times[name] += default_timer() - start
+
+                    if reference is None:
+                        reference = mask
+
+                    different = int((mask != reference).sum())
+                    mismatches[name] += different
+                    if different > 0:
+                        self.error(f"{formName} size {size}: {name} differs from shapely in {different} pixels")
+
+            for name, _ in methods:
+                print(f"{formName}: {name} {times[name]:.3f}s, {mismatches[name]} mismatching pixels")
+
+    def testDistanceField(self):
+        minSize = self.args.min_size if self.args.size is None else self.args.size
+        maxSize = self.args.max_size if self.args.size is None else self.args.size
+
+        # resampled masks may only differ from the geometry in pixels, whose samples are closer to the border
+        # than maxDistance pixels, and the coverage may differ by maxCoverage
+        maxDistance = 0.01
+        maxCoverage = 0.01
+
+        for formName, form in self.forms.items():
+            antiAliasing = form.antiAliasing
+            mismatches = 0
+            ties = 0
+            distanceError = 0.0
+            coverageError = 0.0
+
+            for size in range(minSize, maxSize + 1):
+                # the aspect ratios 1/2 and 2 have masters of another shape
+                for width, height in ((size, size), (size, max(1, size // 2)), (max(1, size // 2), size)):
+                    form.setSize((width, height))
+
+                    form.antiAliasing = False
+                    different = Application.denseMask(form.rasterize()) != form.resampleDistanceField()
+                    parts = form.geometricDistance()
+                    if parts is not None:
+                        distance = np.abs(np.min([np.max(part, axis=0) for part in parts], axis=0))
+
+                        # samples on the border are covered by the field, but the rasterizers decide them by
+                        # the rounding of the scaled coords
+                        tie = different & (distance <= Form.distanceTolerance)
+                        ties += int(tie.sum())
+                        different &= ~tie
+                        if different.any():
+                            distanceError = max(distanceError, float(distance[different].max()))
+
+                    mismatches += int(different.sum())
+
+                    form.antiAliasing = True
+                    mask = form.rasterize()
+                    mask = mask.toMask() if isinstance(mask, Spans) else mask
+                    difference = np.abs(np.asarray(mask, dtype=np.float64) - form.resampleDistanceField())
+                    coverageError = max(coverageError, float(difference.max()))
+
+            form.antiAliasing = antiAliasing
+
+            print(f"{formName}: {mismatches} mismatching pixels, {ties} ties, distance error {distanceError:.4f}, coverage error {coverageError:.4f}")
+            if distanceError > maxDistance:
+                self.error(f"{formName}: mismatching pixels are up to {distanceError:.4f} pixels away from the border")
+            if coverageError > maxCoverage:
+                self.error(f"{formName}: the coverage differs by up to {coverageError:.4f}")
+
+    def testShading(self):
+        seeded = random.Random(0)
+        width, height = 37, 23
+        ys, xs = np.indices((height, width)).reshape(2, -1)
+
+        # every pixel is shaded with the full color and with a random intensity
+        intensities = np.array([seeded.choice((1.0, seeded.random())) for _ in xs])
+
+        for generatorName, generator in self.colors.items():
+            color = Application.scalarColor(generator)
+            if color is None:
+                print(f"{generatorName}: skipped, there are no scalar colors to compare with")
+                continue
+
+            tableSize = generator.tableSize if isinstance(generator, Gradient) else 0
+
+            for mode in (Color.Mode.MONOCHROME, Color.Mode.GREYSCALE, Color.Mode.RGB):
+                generator.reset()
+                for _ in range(generator.colorsRequired() if generator.colorsRequired() > 0 else self.pickerColorCount):
+                    generator.addColor(Color(seeded.randint(0, 255), seeded.randint(0, 255), seeded.randint(0, 255)))
+                generator.newForm()
+
+                reference = np.array([Color.SwapMode(generator.scale(color(generator.progress((int(x), int(y)), (width, height))), intensity), mode).appendValue
+                                      for x, y, intensity in zip(xs, ys, intensities)], dtype=np.int64)
+
+                if isinstance(generator, Gradient):
+                    generator.tableSize = 0
+
+                start = default_timer()
+                colors = generator.shade(xs, ys, intensities, (width, height), mode).astype(np.int64)
+                duration = default_timer() - start
+
+                mismatches = int(np.any(colors != reference, axis=1).sum())
+                print(f"{generatorName} {Color.ModeString(mode)}: {duration * 1000:.3f}ms, {mismatches} mismatching pixels")
+                if mismatches > 0:
+                    self.error(f"{generatorName} {Color.ModeString(mode)}: shade differs from the colors of single pixels in {mismatches} pixels")
+
+                # the lookup tables of --gradient-lut are approximations, so only their difference is shown
+                if tableSize > 0:
+                    generator.tableSize = tableSize
+                    colors = generator.shade(xs, ys, intensities, (width, height), mode).astype(np.int64)
+                    print(f"{generatorName} {Color.ModeString(mode)}: lookup table with {tableSize} entries differs by up to {int(np.abs(colors - reference).max())}")
+
+            generator.reset()
+
+    @staticmethod
+    def scalarColor(generator):
+        # the color of a single pixel by its progress, calculated with scalars like the generators did before shade,
+        # so the reference doesn't share the vectorized progress with shade. None for unknown generators.
+        import math
+        from colors.ColorGenerator import ColorGenerator
+        from colors.LinearGradient import LinearGradient
+        from colors.Picker import Picker
+        from colors.RadialGradient import RadialGradient
+
+        if isinstance(generator, LinearGradient):
+            def color(progress):
+                start, end = generator.coordinates
+                scaledProgress = (
+                    generator.lerp(progress[0], start[0], end[0]),
+                    generator.lerp(progress[1], start[1], end[1])
+                )
+                averageProgress = ColorGenerator.clamp((scaledProgress[0] + scaledProgress[1]) / 2, 0, 1) * generator.progressScale
+                return generator.lerp(averageProgress, generator.colors[0], generator.colors[1])
+        elif isinstance(generator, RadialGradient):
+            def color(progress):
+                direction = (generator.center[0] - progress[0], generator.center[1] - progress[1])
+                distance = math.sqrt(direction[0] * direction[0] + direction[1] * direction[1]) * generator.progressScale
+                return generator.lerp(distance, generator.colors[0], generator.colors[1])
+        elif isinstance(generator, Picker):
+            def color(progress):
+                return generator.color
+        elif type(generator).values is ColorGenerator.values:
+            def color(progress):
+                return generator.colors[0]
+        else:
+            return None
+
+        return color
+
     @staticmethod
-    def replaceLast(s, old, new, occurence=1):
-        li = s.rsplit(old, occurence)
-        return new.join(li)
+    def denseMask(mask):
+        if isinstance(mask, Spans):
+            return mask.toMask()
+
+        return np.asarray(mask) > 0
 
     def info(self, message, subVerbose=False):
         if self.args is None or (not self.args.verbose and not subVerbose):
@@ -10,13 +10,16 @@ class Arguments:
         self.groupForms = None
         self.groupColors = None
         self.groupTests = None
+        self.groupOutput = None
 
     def setupImage(self):
         self.groupImage = self.parser.add_argument_group(title="Image", description="Image properties")
         self.groupImage.add_argument("--width", default=255, type=int, help="The width of the image that shall be created")
         self.groupImage.add_argument("--height", default=255, type=int, help="The height of the image that shall be created")
         self.groupImage.add_argument("--color-mode", type=str, default="rgb", help="The color mode of the generated images. This automatically disables all color generators that does not match the specified color mode. Available color modes are: monochrome, greyscale and rgb")
-        self.groupImage.add_argument("--background-color", type=str, default="0,0,0", help="The background color of the image.")
+        self.groupImage.add_argument("--background-color", type=str, help="The background color of the image. Overrides the background of the color setup (--monochrome, --greyscale or --rgb) of the color mode.")
+        self.groupImage.add_argument("--band-height", type=int,
+                                     help="Renders and saves the image in horizontal bands with the given count of rows. Objects are only recorded while the image is generated and shaded band by band while it is saved. This limits the pixel memory to one band of width x band height and the colors of one object in the band, besides the object masks in the mask cache (--mask-cache-size), which allows images that are larger than the memory.")
 
     def setupObject(self):
         self.groupObject = self.parser.add_argument_group(title="Objects", description="Object properties")
@@ -24,6 +27,24 @@ class Arguments:
                                   help="The size of the objects that shall be created This will overwrite --min-size and --max-size and sets the size to a fixed value.")
         self.groupObject.add_argument("--min-size", default=20, type=int, help="The minimum size of an object")
         self.groupObject.add_argument("--max-size", default=60, type=int, help="The maximum size of an object")
+        self.groupObject.add_argument("--min-rotation", default=0, type=float, help="The minimum clockwise rotation of an object in degrees")
+        self.groupObject.add_argument("--max-rotation", default=0, type=float, help="The maximum clockwise rotation of an object in degrees")
+        self.groupObject.add_argument("--min-aspect", default=1, type=float, help="The minimum ratio of the height to the width of an object")
+        self.groupObject.add_argument("--max-aspect", default=1, type=float, help="The maximum ratio of the height to the width of an object")
+        self.groupObject.add_argument("--min-shear", default=0, type=float, help="The minimum horizontal shear of an object")
+        self.groupObject.add_argument("--max-shear", default=0, type=float, help="The maximum horizontal shear of an object")
+        self.groupObject.add_argument("--mask-cache-size", default=64, type=int,
+                                      help="The maximum memory in MiB of the cache of rasterized object masks")
+        self.groupObject.add_argument("--mask-atlas", type=str,
+                                      help="Memory maps the prerendered object masks of an atlas file, which was built with --build-mask-atlas. Masks of forms, whose source has changed since, are rasterized again.")
+        self.groupObject.add_argument("--build-mask-atlas", type=str,
+                                      help="Prerenders the masks of all forms and the dashed bounding box border for every size from --min-size to --max-size, with and without anti-aliasing, into the given atlas file instead of generating images.")
+        self.groupObject.add_argument("--anti-aliasing", action="store_true",
+                                      help="Renders the edges of the objects with anti-aliasing. The covered area of every edge pixel is approximated from its signed distance to the edge, which is exact for horizontal and vertical edges.")
+        self.groupObject.add_argument("--distance-field", action="store_true",
+                                      help="Resamples the object masks from a signed distance field, which is calculated once per form and aspect ratio at 256 pixels, instead of rasterizing every size from the geometry. Up to 256 pixels the masks of polygons match the geometry, circles only differ in pixels within 0.002 pixels of the border, the coverage with --anti-aliasing differs by less than 0.005 and forms without a geometric distance may differ in pixels within half a pixel of the 256 pixel mask from the border. --test-distance-field measures the differences.")
+        self.groupObject.add_argument("--rasterizer", type=str, default="auto", choices=["auto", "numpy", "shapely-vectorized", "shapely"],
+                                      help="The backend, which rasterizes the polygon objects. auto uses numpy, shapely-vectorized requires shapely 2 and shapely tests every pixel on its own and is the slow reference.")
 
     def setupGenerator(self):
         self.groupGenerator = self.parser.add_argument_group(title="Generation", description="Image generating properties")
@@ -45,15 +66,28 @@ class Arguments:
                                      help="Monochrome color setup. <BackgroundColor>,<ObjectColor> with 0 for black and 1 for white.")
         self.groupGenerator.add_argument("--greyscale", type=str, default="fixed,64/fixed,192/64",
                                      help="Geyscale color setup. Color values have to be in range from 0 (black) to 255 (white). Format is <Background>/<Object>[/<Distance>]. Background and object can be fixed,<Color> or random,<min>,<max> with min <= x <= max. Distance is a number that describes the minimum color distance between background and object, that has to taken care of.")
-        self.groupGenerator.add_argument("--rgb", type=str, default="fixed,0,0,0/fixed,255,0,0,100",
-                                     help="RGB color setup. Color values are always RGB and each component has to be in a range from 0 to 255. Format is <Background>/<Object>[/<Distance>. Background and object color can be fixed,<R>,<G>,<B> or random,<Rmin>,<Gmin>,<Bmin>,<Rmax>,<Gmax>,<Bmax>. The distance has to be a number which represents the minimum distance between two colors, if both colors are treated as 3D vectors.")
-        self.groupGenerator.add_argument("--gradient", type=str, default="fixed,0,0,0/fixed,255,0,0/fixed,0,255,0/100",
-                                     help="Gradient color setup. Color values are always RGB and each component has to be in a range form 0 to 255. Format is <Background>/<ObjectFrom>/<ObjectTo>[/<Distance]. Background, ObjectFrom and ObjectTo can be fixed,<R>,<G>,<B> or random<Rmin>,<Gmin>,<Bmin>,<Rmax>,<Gmax>,<Bmax>. The distance has to be a number, which represents the minimum distance between Background and ObjectFrom aswell as Background and ObjectTo, if all colors are treated as 3D vectors.")
+        self.groupGenerator.add_argument("--rgb", type=str, default="fixed,0,0,0/random,0,0,0,255,255,255/100",
+                                     help="RGB color setup. Color values are always RGB and each component has to be in a range from 0 to 255. Format is <Background>/<Object>[/<Distance>]. Background and object color can be fixed,<R>,<G>,<B> or random,<Rmin>,<Gmin>,<Bmin>,<Rmax>,<Gmax>,<Bmax>. The distance has to be a number which represents the minimum distance between two colors, if both colors are treated as 3D vectors.")
+        self.groupGenerator.add_argument("--gradient", type=str, default="fixed,0,0,0/random,0,0,0,255,255,255/random,0,0,0,255,255,255/100",
+                                     help="Gradient color setup. Color values are always RGB and each component has to be in a range form 0 to 255. Format is <Background>/<ObjectFrom>/<ObjectTo>[/<Distance>]. Background, ObjectFrom and ObjectTo can be fixed,<R>,<G>,<B> or random,<Rmin>,<Gmin>,<Bmin>,<Rmax>,<Gmax>,<Bmax>. The distance has to be a number, which represents the minimum distance between Background and ObjectFrom aswell as Background and ObjectTo, if all colors are treated as 3D vectors. ObjectTo also keeps the distance to ObjectFrom. The image background is always taken from --background-color or the color setup of the color mode, so the background of the gradient setup is ignored.")
+        self.groupGenerator.add_argument("--gradient-lut", type=int, default=0,
+                                     help="The entries of the lookup tables of gradient colors. Gradients look up the color of the nearest of this many progresses instead of calculating the color of every pixel. The tables are built once per pair of gradient colors and color mode. 0 disables the tables.")
         self.groupGenerator.add_argument("--render-bounding-box", action="store_true",
                                help="Renders the bounding boxes for all generated objects")
         self.groupGenerator.add_argument("--bounding-box-fill", type=str, help="The background color of the bounding box")
         self.groupGenerator.add_argument("--bounding-box-border", type=str, help="The border color of the bounding box")
 
+    def setupOutput(self):
+        self.groupOutput = self.parser.add_argument_group(title="Output", description="Output properties")
+        self.groupOutput.add_argument("--dataset", type=str,
+                                      help="Stores all images in a single memory mapped .npy file with the shape (count, height, width, channels) instead of separate PNG files. Monochrome images are stored bit-packed with 8 pixels per byte (most significant bit first) in the shape (count, height, ceil(width / 8)), which can be unpacked with numpy.unpackbits(images, axis=2, count=width). The meta data is stored in a structured array next to it (<name>.meta.npy).")
+        self.groupOutput.add_argument("--png-encoder", type=str, default="pypng", choices=["pypng", "zlib"],
+                                      help="The PNG encoder. pypng is the compatible default, zlib filters the rows with numpy and compresses them directly with zlib.")
+        self.groupOutput.add_argument("--png-compression", type=int, choices=range(10), metavar="[0-9]",
+                                      help="The zlib compression level of the PNG files from 0 (fastest) to 9 (smallest). Uses the zlib default, if not set.")
+        self.groupOutput.add_argument("--png-filter", type=str, default="adaptive", choices=["none", "sub", "up", "paeth", "adaptive"],
+                                      help="The PNG row filter of the zlib encoder. adaptive chooses the best filter for every row.")
+
     def setupForms(self, forms=[]):
         if len(forms) > 0:
             self.groupForms = self.parser.add_argument_group(title="Forms", description="Form properties")
@@ -88,6 +122,7 @@ class Arguments:
         self.setupImage()
         self.setupObject()
         self.setupGenerator()
+        self.setupOutput()
         self.setupForms(forms)
         self.setupColors(colors)
         self.setupTests(tests)
@@ -1,8 +1,5 @@
-from shapely.geometry import Point, Polygon
-
 from forms.Rectangle import Rectangle
 from DashedBorder import DashedBorder
-from colors.Flat import Flat
 from Color import Color
 
 
@@ -168,6 +165,9 @@ class BoundingBox:
 
         @author Tarek Schwarzinger
         """
+        # shapely is only imported, when the polygon is used
+        from shapely.geometry import Polygon
+
         return Polygon([
             self.topLeft,
             self.topRight,
@@ -175,24 +175,6 @@ class BoundingBox:
             self.bottomLeft
         ])
 
-    @staticmethod
-    def convertColor(color, colorMode):
-        """
-        @brief Color to Color Generator: Flat
-
-        Creates a flat color generator for the bounding box.
-
-        @param color The color that shall be used for the flat color generator.
-        @param colorMode The color mode that is required for the bounding box, to fit the color mode of the image.
-
-        @return Returns the created flat color generator.
-
-        @author Tarek Schwarzinger
-        """
-        generator = Flat()
-        generator.addColor(Color.SwapMode(color, colorMode))
-        return generator
-
     def render(self, image):
         """
         @brief Render
@@ -203,11 +185,8 @@ class BoundingBox:
 
         @author Tarek Schwarzinger
         """
-        backgroundGenerator = BoundingBox.convertColor(self.backgroundColor, image.colorMode)
-        image.addForm(self.position, self.background, backgroundGenerator)
-
-        borderGenerator = BoundingBox.convertColor(self.borderColor, image.colorMode)
-        image.addForm(self.position, self.border, borderGenerator)
+        image.blitMask(self.position, self.background.mask(), self.backgroundColor)
+        image.blitMask(self.position, self.border.mask(), self.borderColor)
 
     def isOverlapping(self, other):
         """
@@ -226,7 +205,9 @@ class BoundingBox:
         if not isinstance(other, BoundingBox):
             raise ValueError(f"Other is not an instance of a bounding box: {other}")
 
-        return self.polygon.intersects(other.polygon)
+        # like the intersects test of the polygons, touching bounding boxes are overlapping
+        return self.topLeft[0] <= other.bottomRight[0] and other.topLeft[0] <= self.bottomRight[0] \
+            and self.topLeft[1] <= other.bottomRight[1] and other.topLeft[1] <= self.bottomRight[1]
 
     def __str__(self):
         """
@@ -14,21 +14,75 @@ class Color:
             self.__a = a
             self.__b = b
 
+        @property
+        def minimum(self):
+            return self.__a
+
+        @property
+        def maximum(self):
+            return self.__b
+
         @property
         def get(self):
             return Color.Random(self.__a, self.__b)
 
-    def __init__(self, r, g, b, mode=Mode.RGB):
+    __slots__ = ("__r", "__g", "__b", "__mode", "__grey", "__value", "__appendValue")
+
+    # Identical colors share one instance, the cache is cleared if it grows too large
+    __instances = {}
+    __instanceLimit = 65536
+
+    def __new__(cls, r, g, b=None, mode=Mode.RGB):
         if isinstance(r, tuple):
-            self.__r = int(max(0, min(255, r[0])))
-            self.__g = int(max(0, min(255, r[1])))
-            self.__b = int(max(0, min(255, r[2])))
-            self.__mode = g
-        else:
-            self.__r = int(max(0, min(255, r)))
-            self.__g = int(max(0, min(255, g)))
-            self.__b = int(max(0, min(255, b)))
-            self.__mode = mode
+            mode = g
+            r, g, b = r[0], r[1], r[2]
+
+        key = (
+            int(max(0, min(255, r))),
+            int(max(0, min(255, g))),
+            int(max(0, min(255, b))),
+            mode
+        )
+
+        color = Color.__instances.get(key)
+        if color is not None:
+            return color
+
+        if len(Color.__instances) >= Color.__instanceLimit:
+            Color.__instances.clear()
+
+        color = object.__new__(cls)
+        setter = object.__setattr__
+        setter(color, "_Color__r", key[0])
+        setter(color, "_Color__g", key[1])
+        setter(color, "_Color__b", key[2])
+        setter(color, "_Color__mode", key[3])
+        # Weighted method or luminosity method
+        setter(color, "_Color__grey", int(0.3 * key[0] + 0.59 * key[1] + 0.11 * key[2]))
+        # Average method
+        # setter(color, "_Color__grey", int((key[0] + key[1] + key[2]) / 3))
+
+        value = color.convert(mode) if mode in [Color.Mode.MONOCHROME, Color.Mode.GREYSCALE, Color.Mode.RGB] else None
+        setter(color, "_Color__value", value)
+        setter(color, "_Color__appendValue", value if isinstance(value, tuple) else (value,))
+
+        Color.__instances[key] = color
+        return color
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Color is immutable, use Color.SwapMode to change the color mode")
+
+    def __eq__(self, other):
+        if not isinstance(other, Color):
+            return NotImplemented
+
+        return (self.__r, self.__g, self.__b, self.__mode) == (other.__r, other.__g, other.__b, other.__mode)
+
+    def __hash__(self):
+        return hash((self.__r, self.__g, self.__b, self.__mode))
+
+    def __reduce__(self):
+        return Color, (self.__r, self.__g, self.__b, self.__mode)
 
     @property
     def r(self):
@@ -46,25 +100,15 @@ class Color:
     def mode(self):
         return self.__mode
 
-    @mode.setter
-    def mode(self, newmode):
-        if newmode not in [Color.Mode.MONOCHROME, Color.Mode.GREYSCALE, Color.Mode.RGB]:
-            raise ValueError(f"Unknown new color mode {newmode}")
-
-        self.__mode = newmode
-
     @property
     def modeName(self):
         return Color.ModeString(self.__mode)
 
     def asGreyscale(self):
-        # Weighted method or luminosity method
-        return int(0.3 * self.__r + 0.59 * self.__g + 0.11 * self.__b)
-        # Average method
-        # return int((self.__r + self.__g + self.__b) / 3)
+        return self.__grey
 
     def asMonochrome(self):
-        return int(self.asGreyscale() >= 128)
+        return int(self.__grey >= 128)
 
     def convert(self, mode):
         if mode == Color.Mode.MONOCHROME:
@@ -78,18 +122,23 @@ class Color:
 
     @property
     def value(self):
-        return self.convert(self.__mode)
+        if self.__value is None:
+            raise ValueError(f"Invalid color mode {self.__mode} found")
+
+        return self.__value
 
     @property
     def appendValue(self):
-        value = self.value
-        if isinstance(value, tuple):
-            return value
+        if self.__value is None:
+            raise ValueError(f"Invalid color mode {self.__mode} found")
 
-        return [value]
+        return self.__appendValue
 
     @staticmethod
     def SwapMode(c, mode):
+        if c.mode == mode:
+            return c
+
         return Color(c.r, c.g, c.b, mode)
 
     @staticmethod
@@ -0,0 +1,361 @@
+import numpy as np
+
+from Color import Color
+
+
+class ColorSampler:
+    """
+    @brief Color Sampler
+
+    Color specification, that is parsed once and can draw colors afterwards. Ranges draw their colors in
+    batches, so a single color is a lookup into the current batch.
+    """
+
+    class Fixed:
+        """
+        @brief Fixed color
+
+        Sampler, which always returns the same color.
+        """
+
+        def __init__(self, color):
+            """
+            @brief Constructor
+
+            @param color The color that is returned.
+            """
+            self.color = color
+            self.mode = color.mode
+            self.minimum = np.asarray([color.r, color.g, color.b], dtype=np.int32)
+            self.maximum = self.minimum
+
+        def sample(self, count):
+            """
+            @brief Sample
+
+            @param count The count of colors.
+
+            @return Returns \p count colors as RGB values in an uint8 array with the shape (count, 3).
+            """
+            return np.broadcast_to(self.minimum.astype(np.uint8), (count, 3)).copy()
+
+        def get(self):
+            """
+            @brief Get
+
+            @return Returns the color.
+            """
+            return self.color
+
+    class Range:
+        """
+        @brief Color range
+
+        Sampler, which draws uniformly distributed colors from min <= x <= max for every channel.
+        """
+
+        def __init__(self, minColor, maxColor, batchSize=1024):
+            """
+            @brief Constructor
+
+            @param minColor The minimum of every channel as Color.
+            @param maxColor The maximum of every channel as Color.
+            @param batchSize The count of colors that is drawn at once.
+
+            @attention If a minimum is larger than its maximum, a ValueError will be raised.
+            """
+            self.mode = minColor.mode
+            self.minimum = np.asarray([minColor.r, minColor.g, minColor.b], dtype=np.int32)
+            self.maximum = np.asarray([maxColor.r, maxColor.g, maxColor.b], dtype=np.int32)
+            self.batchSize = batchSize
+            self.batch = []
+
+            if np.any(self.minimum > self.maximum):
+                raise ValueError(f"Minimum color {minColor} is larger than maximum color {maxColor}")
+
+        def sample(self, count):
+            """
+            @brief Sample
+
+            @param count The count of colors.
+
+            @return Returns \p count colors as RGB values in an uint8 array with the shape (count, 3).
+            """
+            values = np.random.randint(self.minimum, self.maximum + 1, size=(count, 3))
+
+            # greyscale and monochrome ranges describe grey values
+            if self.mode != Color.Mode.RGB:
+                values[:, 1] = values[:, 0]
+                values[:, 2] = values[:, 0]
+
+            return values.astype(np.uint8)
+
+        def get(self):
+            """
+            @brief Get
+
+            @return Returns the next color of the current batch. A new batch is drawn, if it is exhausted.
+            """
+            if len(self.batch) == 0:
+                self.batch = [Color(int(r), int(g), int(b), self.mode) for r, g, b in self.sample(self.batchSize)]
+                self.batch.reverse()
+
+            return self.batch.pop()
+
+    @staticmethod
+    def Compile(s, mode=Color.Mode.RGB):
+        """
+        @brief Compile
+
+        Parses a color specification, like Color.FromString does, into a sampler.
+
+        @param s The color specification.
+        @param mode The color mode of the specification.
+
+        @return Returns either a ColorSampler.Fixed or a ColorSampler.Range.
+        """
+        color = Color.FromString(s, mode)
+        if isinstance(color, Color.Range):
+            return ColorSampler.Range(color.minimum, color.maximum)
+
+        return ColorSampler.Fixed(color)
+
+    @staticmethod
+    def Distance(values, references, mode):
+        """
+        @brief Distance
+
+        Calculates the distance of every color to every reference color. RGB colors are treated as 3D
+        vectors, greyscale and monochrome colors are compared by their grey value.
+
+        @param values The colors as RGB values in an array with the shape (count, 3).
+        @param references The reference colors as RGB values in an array with the shape (references, 3).
+        @param mode The color mode of the colors.
+
+        @return Returns the distances as array with the shape (count, references).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        references = np.asarray(references, dtype=np.float64).reshape(-1, 3)
+        if mode != Color.Mode.RGB:
+            values = values[:, :1]
+            references = references[:, :1]
+
+        differences = values[:, None, :] - references[None, :, :]
+        return np.sqrt(np.sum(differences * differences, axis=2))
+
+    @staticmethod
+    def KeepsDistance(background, sampler, distance):
+        """
+        @brief Keeps distance
+
+        Checks, if the sampler can draw a color, that keeps the distance to every color of the background sampler.
+        The farthest color of a range is one of its corners, so the farthest distance is the largest distance
+        of every channel to the minimum or maximum of the range. The background color, whose farthest color is
+        the nearest one, is the closest color to the middle of the range.
+
+        @param background The sampler of the background colors.
+        @param sampler The sampler the colors are drawn from.
+        @param distance The minimum distance to the background colors.
+
+        @return Returns True, if a color keeps the distance for every background color, otherwise False.
+        """
+        channels = 3 if sampler.mode == Color.Mode.RGB else 1
+        minimum = sampler.minimum[:channels].astype(np.float64)
+        maximum = sampler.maximum[:channels].astype(np.float64)
+
+        worst = np.clip(np.round((minimum + maximum) / 2), background.minimum[:channels], background.maximum[:channels])
+        farthest = np.maximum(np.abs(worst - minimum), np.abs(worst - maximum))
+        return np.sqrt(np.sum(farthest * farthest)) >= distance
+
+    @staticmethod
+    def FarthestDistance(first, second):
+        """
+        @brief Farthest distance
+
+        Calculates the largest distance between a color of the first and a color of the second sampler. The
+        farthest colors are corners of the ranges, so every channel contributes its largest distance between the
+        minimum of one range and the maximum of the other one.
+
+        @param first The sampler of the first colors.
+        @param second The sampler of the second colors.
+
+        @return Returns the largest distance.
+        """
+        channels = 3 if first.mode == Color.Mode.RGB else 1
+        farthest = np.maximum(np.abs(first.maximum - second.minimum), np.abs(second.maximum - first.minimum))
+        farthest = farthest[:channels].astype(np.float64)
+        return float(np.sqrt(np.sum(farthest * farthest)))
+
+    @staticmethod
+    def Lattice(sampler, maxPoints):
+        """
+        @brief Lattice
+
+        Enumerates the colors of a sampler on a regular lattice with at most about \p maxPoints points.
+        The lattices are cached by the sampler for every count of points.
+
+        @param sampler The sampler.
+        @param maxPoints The maximum count of lattice points.
+
+        @return Returns the lattice as RGB values in an array with the shape (count, 3).
+        """
+        lattices = getattr(sampler, "lattices", None)
+        if lattices is None:
+            lattices = sampler.lattices = {}
+
+        lattice = lattices.get(maxPoints)
+        if lattice is not None:
+            return lattice
+
+        channels = 3 if sampler.mode == Color.Mode.RGB else 1
+        extent = (sampler.maximum - sampler.minimum + 1)[:channels]
+        stride = max(1, int(np.ceil((np.prod(extent) / maxPoints) ** (1 / channels))))
+
+        axes = [np.arange(sampler.minimum[c], sampler.maximum[c] + 1, stride) for c in range(channels)]
+        lattice = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, channels)
+        if channels == 1:
+            lattice = np.repeat(lattice, 3, axis=1)
+
+        lattices[maxPoints] = lattice
+        return lattice
+
+    @staticmethod
+    def SampleDistant(sampler, count, references, distances, rounds=4, maxPoints=2 ** 15):
+        """
+        @brief Sample distant colors
+
+        Draws colors, that keep a minimum distance to all reference colors. Candidates are drawn in batches and
+        rejected vectorized. If most of the range is rejected, the colors are drawn directly from the feasible
+        points of a lattice over the range.
+
+        @param sampler The sampler the colors are drawn from.
+        @param count The count of colors.
+        @param references The reference colors as RGB values in an array with the shape (references, 3).
+        @param distances The minimum distance to the reference colors, either one for all or one per reference.
+        @param rounds The count of rejection rounds before the lattice is used.
+        @param maxPoints The maximum count of lattice points.
+
+        @return Returns \p count colors as RGB values in an uint8 array with the shape (count, 3).
+
+        @attention If no color of the sampler keeps the distance, a ValueError will be raised.
+        """
+        references = np.asarray(references).reshape(-1, 3)
+        distances = np.broadcast_to(np.asarray(distances, dtype=np.float64), (len(references),))
+        if np.all(distances <= 0):
+            return sampler.sample(count)
+
+        accepted = np.empty((0, 3), dtype=np.uint8)
+        batchSize = max(64, 4 * count)
+        for _ in range(rounds):
+            candidates = sampler.sample(batchSize)
+            candidates = candidates[np.all(ColorSampler.Distance(candidates, references, sampler.mode) >= distances, axis=1)]
+            accepted = np.vstack((accepted, candidates))
+            if len(accepted) >= count:
+                return accepted[:count]
+
+        lattice = ColorSampler.Lattice(sampler, maxPoints)
+        feasible = lattice[np.all(ColorSampler.Distance(lattice, references, sampler.mode) >= distances, axis=1)]
+        if len(feasible) == 0:
+            raise ValueError(f"No color in range {sampler.minimum} to {sampler.maximum} keeps a distance of {distances} to {references.tolist()}")
+
+        picked = feasible[np.random.randint(0, len(feasible), size=count - len(accepted))]
+        return np.vstack((accepted, picked.astype(np.uint8)))
+
+    @staticmethod
+    def HasDistant(sampler, references, distances, maxPoints=2 ** 15):
+        """
+        @brief Has distant colors
+
+        Checks, if a point of the lattice, that SampleDistant falls back to, keeps a minimum distance to all
+        reference colors. If it does, SampleDistant can draw a color with the same references and distances.
+
+        @param sampler The sampler the colors are drawn from.
+        @param references The reference colors as RGB values in an array with the shape (references, 3).
+        @param distances The minimum distance to the reference colors, either one for all or one per reference.
+        @param maxPoints The maximum count of lattice points, like the one of SampleDistant.
+
+        @return Returns True, if a color keeps the distances, otherwise False.
+        """
+        references = np.asarray(references).reshape(-1, 3)
+        distances = np.broadcast_to(np.asarray(distances, dtype=np.float64), (len(references),))
+        if np.all(distances <= 0):
+            return True
+
+        lattice = ColorSampler.Lattice(sampler, maxPoints)
+        return bool(np.any(np.all(ColorSampler.Distance(lattice, references, sampler.mode) >= distances, axis=1)))
+
+    @staticmethod
+    def DistantCandidates(samplers, references, distance, objectDistance, colors=(), maxPoints=2 ** 10):
+        """
+        @brief Distant candidates
+
+        Enumerates the candidates for the next color of a set of object colors, like the endpoints of a gradient.
+        Candidates are the points of a lattice over the next sampler, which keep the distance to the reference
+        colors and the object distance to the colors of the previous samplers. They also have to leave a point
+        of the lattice over every later sampler, that keeps the same distances and the object distance to the
+        candidate. This is exact for pairs of colors on the lattices.
+
+        @param samplers The samplers of all object colors.
+        @param references The reference colors as RGB values in an array with the shape (references, 3).
+        @param distance The minimum distance to the reference colors.
+        @param objectDistance The minimum distance between the object colors.
+        @param colors The colors of the previous samplers as RGB values in an array with the shape (colors, 3).
+        @param maxPoints The maximum count of lattice points per sampler.
+
+        @return Returns the candidates as RGB values in an array with the shape (count, 3).
+        """
+        references = np.asarray(references).reshape(-1, 3)
+        colors = np.asarray(colors).reshape(-1, 3)
+        mode = samplers[0].mode
+
+        def feasible(sampler):
+            lattice = ColorSampler.Lattice(sampler, maxPoints)
+            keeps = np.all(ColorSampler.Distance(lattice, references, mode) >= distance, axis=1) \
+                & np.all(ColorSampler.Distance(lattice, colors, mode) >= objectDistance, axis=1)
+            return lattice[keeps]
+
+        # the lattices are integers, so the squared distances of all pairs are exact even with the floating point
+        # matrix product
+        channels = 3 if mode == Color.Mode.RGB else 1
+        squaredObjectDistance = np.ceil(objectDistance * objectDistance) if objectDistance > 0 else 0
+
+        candidates = feasible(samplers[len(colors)])
+        for sampler in samplers[len(colors) + 1:]:
+            points = feasible(sampler)[:, :channels].astype(np.float64)
+            values = candidates[:, :channels].astype(np.float64)
+            squared = np.sum(values * values, axis=1)[:, None] + np.sum(points * points, axis=1)[None, :] - 2 * (values @ points.T)
+            candidates = candidates[np.any(squared >= squaredObjectDistance, axis=1)]
+
+        return candidates
+
+    @staticmethod
+    def SampleDistantObjects(samplers, references, distance, objectDistance, colors=(), maxPoints=2 ** 10):
+        """
+        @brief Sample distant objects
+
+        Draws the remaining colors of a set of object colors from the candidates of DistantCandidates, so every
+        color leaves colors for the later samplers.
+
+        @param samplers The samplers of all object colors.
+        @param references The reference colors as RGB values in an array with the shape (references, 3).
+        @param distance The minimum distance to the reference colors.
+        @param objectDistance The minimum distance between the object colors.
+        @param colors The colors of the previous samplers as RGB values in an array with the shape (colors, 3).
+        @param maxPoints The maximum count of lattice points per sampler.
+
+        @return Returns the colors of the remaining samplers as RGB values in an uint8 array with the shape (count, 3).
+
+        @attention If no set of colors keeps the distances, a ValueError will be raised.
+        """
+        colors = [tuple(color) for color in np.asarray(colors).reshape(-1, 3)]
+        start = len(colors)
+
+        while len(colors) < len(samplers):
+            candidates = ColorSampler.DistantCandidates(samplers, references, distance, objectDistance, colors, maxPoints)
+            if len(candidates) == 0:
+                ranges = [(sampler.minimum.tolist(), sampler.maximum.tolist()) for sampler in samplers]
+                raise ValueError(f"No colors in the ranges {ranges} keep a distance of {distance} to {np.asarray(references).tolist()} and of {objectDistance} to each other")
+
+            colors.append(tuple(candidates[np.random.randint(0, len(candidates))]))
+
+        return np.asarray(colors[start:], dtype=np.uint8)
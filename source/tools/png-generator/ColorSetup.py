@@ -0,0 +1,107 @@
+import numpy as np
+
+from Color import Color
+from ColorSampler import ColorSampler
+
+
+class ColorSetup:
+    """
+    @brief Color Setup
+
+    Compiled color setup of a color mode, like --rgb, --greyscale, --monochrome or --gradient. It consists of
+    a background sampler, one sampler per object color and the minimum distance that object colors have to
+    keep to the background. The object colors of one object, like the endpoints of a gradient, can also
+    keep a minimum distance to each other.
+    """
+
+    # draws of an object color, which leaves no colors for the later object colors, before they are drawn together
+    rounds = 4
+
+    def __init__(self, background, objects, distance=0, objectDistance=None):
+        """
+        @brief Constructor
+
+        @param background The sampler of the background color.
+        @param objects The list of samplers of the object colors.
+        @param distance The minimum distance between the background and the object colors.
+        @param objectDistance The minimum distance between the object colors. Defaults to \p distance.
+        """
+        self.background = background
+        self.objects = objects
+        self.distance = distance
+        self.objectDistance = distance if objectDistance is None else objectDistance
+
+    @staticmethod
+    def Parse(s, mode, objectCount=1):
+        """
+        @brief Parse
+
+        Parses a color setup in the format <Background>/<Object>[/<Object>...][/<Distance>]. Monochrome setups
+        have the format <Background>,<Object>.
+
+        @param s The color setup string.
+        @param mode The color mode of the colors.
+        @param objectCount The count of object colors the setup contains.
+
+        @attention If the setup can't be parsed, a ValueError will be raised.
+        """
+        parts = s.split("," if mode == Color.Mode.MONOCHROME else "/")
+        if len(parts) not in [1 + objectCount, 2 + objectCount]:
+            raise ValueError(f"Expected {1 + objectCount} or {2 + objectCount} parts in color setup {s}, but found {len(parts)}")
+
+        distance = 0
+        if len(parts) == 2 + objectCount:
+            try:
+                distance = float(parts[-1])
+            except ValueError:
+                raise ValueError(f"Expected the distance of color setup {s} to be a number")
+
+        samplers = [ColorSampler.Compile(part, mode) for part in parts[:1 + objectCount]]
+        return ColorSetup(samplers[0], samplers[1:], distance)
+
+    def sampleObjects(self, background, count=None):
+        """
+        @brief Sample objects
+
+        Draws object colors, which keep the distance to the background. If the setup has several object colors,
+        like the endpoints of a gradient, every color also keeps the object distance to the previous ones. A color
+        is only taken, if it leaves colors for the later ones, otherwise the remaining colors are drawn together
+        with ColorSampler.SampleDistantObjects.
+
+        @param background The background color.
+        @param count The count of colors, if the setup has a single object color. Defaults to 1.
+
+        @return Returns the list of object colors.
+
+        @attention If no set of object colors keeps the distances, a ValueError will be raised.
+        """
+        references = [(background.r, background.g, background.b)]
+        distances = [self.distance]
+
+        if len(self.objects) == 1:
+            sampler = self.objects[0]
+            values = ColorSampler.SampleDistant(sampler, count or 1, references, distances)
+            return [Color(int(r), int(g), int(b), sampler.mode) for r, g, b in values]
+
+        values = []
+        for index, sampler in enumerate(self.objects):
+            value = None
+            for _ in range(ColorSetup.rounds):
+                r, g, b = ColorSampler.SampleDistant(sampler, 1, references, distances)[0]
+                candidate = (int(r), int(g), int(b))
+                if all(ColorSampler.HasDistant(later, references + [candidate], distances + [self.objectDistance])
+                       for later in self.objects[index + 1:]):
+                    value = candidate
+                    break
+
+            if value is None:
+                # most colors of the sampler leave no colors for the later ones
+                rest = ColorSampler.SampleDistantObjects(self.objects, references[:1], self.distance, self.objectDistance, values)
+                values.extend((int(r), int(g), int(b)) for r, g, b in rest)
+                break
+
+            values.append(value)
+            references.append(value)
+            distances.append(self.objectDistance)
+
+        return [Color(r, g, b, sampler.mode) for (r, g, b), sampler in zip(values, self.objects)]
@@ -1,4 +1,7 @@
+import numpy as np
+
 from forms.PolygonForm import PolygonForm
+from forms.Spans import Spans
 
 
 class DashedBorder(PolygonForm):
@@ -9,8 +12,6 @@ class DashedBorder(PolygonForm):
         self.__margin = margin
         self.coords = None
 
-        self.__updateCoords()
-
     def __addRect(self, topLeft: tuple, bottomRight: tuple) -> None:
         top = topLeft[1] / self.getHeight
         left = topLeft[0] / self.getWidth
@@ -66,7 +67,58 @@ class DashedBorder(PolygonForm):
 
     def setSize(self, size):
         PolygonForm.setSize(self, size)
-        self.__updateCoords()
+        self.coords = None
+
+    def parameters(self):
+        return self.__thickness, self.__length, self.__margin
+
+    def templates(self):
+        # the polygons are only needed as reference, so they are built on demand
+        if self.coords is None:
+            self.__updateCoords()
+
+        return self.coords
+
+    @staticmethod
+    def __pixels(first, last, extent):
+        # pixels [start, end) covered from first to last including the end pixel. The coords are divided and
+        # multiplied by the extent like the relative polygon coords, so both round the same way.
+        start = np.ceil(np.asarray(first) / extent * extent).astype(np.int64)
+        end = np.floor(np.asarray(last) / extent * extent).astype(np.int64) + 1
+        return np.clip(start, 0, extent), np.clip(end, 0, extent)
+
+    def __dashes(self, extent):
+        # runs [start, end) of the dash pattern along a side: the corners and the dashes in between, which
+        # repeat every length + margin pixels
+        unitLength = self.__length + self.__margin + 1
+        starts = np.arange(unitLength, extent - unitLength, self.__length + self.__margin)
+        ends = np.minimum(starts + self.__length, extent - unitLength)
+
+        starts, ends = DashedBorder.__pixels(
+            np.concatenate(([0, extent - self.__length], starts)),
+            np.concatenate(([self.__length, extent], ends)),
+            extent)
+        return [(start, end) for start, end in zip(starts.tolist(), ends.tolist()) if start < end]
+
+    def rasterize(self):
+        if self.antiAliasing:
+            return PolygonForm.rasterize(self)
+
+        width, height = self.getWidth, self.getHeight
+        thickness = self.__thickness
+
+        # the horizontal strips cover the rows from 0 to thickness and from height - thickness to height
+        top, bottom = DashedBorder.__pixels([0, height - thickness], [thickness, height], height)
+        left, right = DashedBorder.__pixels([0, width - thickness], [thickness, width], width)
+
+        boxes = []
+        for start, end in self.__dashes(width):
+            boxes.append((top[0], bottom[0], start, end))
+            boxes.append((top[1], bottom[1], start, end))
+
+        for start, end in self.__dashes(height):
+            boxes.append((start, end, left[0], right[0]))
+            boxes.append((start, end, left[1], right[1]))
 
-    def generate(self):
-        return PolygonForm.generateMultiplePolygons(self, self.coords)
+        boxes = [box for box in boxes if box[0] < box[1] and box[2] < box[3]]
+        return Spans(boxes, (height, width))
@@ -0,0 +1,117 @@
+import numpy as np
+from numpy.lib.format import open_memmap
+
+
+class Dataset:
+    """
+    @brief Dataset
+
+    Stores a whole batch of images in a single memory mapped .npy file with the shape
+    (count, height, width, channels). Monochrome images keep their bit-packed rows with 8 pixels per byte, most
+    significant bit first, and are stored with the shape (count, height, ceil(width / 8)), which can be unpacked
+    with numpy.unpackbits(images, axis=2, count=width). The meta data of every image is stored in a parallel .npy
+    file containing a structured array with the shape (count, maxObjects). Unused entries have a formLayer of -1.
+    The formName field is at least 32 characters wide and grows to fit the longest form name of the dataset.
+    """
+
+    minFormNameLength = 32
+
+    @staticmethod
+    def annotationType(formNameLength):
+        """
+        @brief Annotation type
+
+        @param formNameLength The maximum length of a form name.
+
+        @return Returns the structured type of a single annotation.
+        """
+        return np.dtype([
+            ("formName", f"U{formNameLength}"),
+            ("x", np.int32),
+            ("y", np.int32),
+            ("width", np.int32),
+            ("height", np.int32),
+            ("formLayer", np.int32)
+        ])
+
+    def __init__(self, fileName, count, imageShape, maxObjects, formNames=()):
+        """
+        @brief Constructor
+
+        Preallocates the image and the annotation file of the dataset.
+
+        @param fileName The file name of the image file. The annotations are stored next to it.
+        @param count The count of images the dataset contains.
+        @param imageShape The shape of the pixel buffer of every image.
+        @param maxObjects The maximum count of objects per image.
+        @param formNames The names of all forms that may be written into the dataset.
+        """
+        self.fileName = fileName
+        self.formNameLength = max([Dataset.minFormNameLength] + [len(name) for name in formNames])
+        self.images = open_memmap(fileName, mode="w+", dtype=np.uint8, shape=(count,) + tuple(imageShape))
+        self.annotations = open_memmap(Dataset.annotationFileName(fileName), mode="w+",
+                                       dtype=Dataset.annotationType(self.formNameLength),
+                                       shape=(count, maxObjects))
+        self.annotations["formLayer"] = -1
+
+    @staticmethod
+    def annotationFileName(fileName):
+        """
+        @brief Annotation file name
+
+        @param fileName The file name of the image file.
+
+        @return Returns the file name of the annotation file that belongs to \p fileName.
+        """
+        if fileName.endswith(".npy"):
+            fileName = fileName[:-len(".npy")]
+
+        return fileName + ".meta.npy"
+
+    def write(self, index, image, meta):
+        """
+        @brief Write
+
+        Writes an image and its meta data into the slot \p index of the dataset.
+
+        @param index The index of the image inside of the dataset.
+        @param image The rendered image.
+        @param meta The meta data of the image.
+
+        @attention If the image has not the shape of the dataset, has more objects than the dataset supports or
+        contains a form name that is longer than the formName field, a ValueError will be raised.
+        """
+        if image.buffer.shape != self.images.shape[1:]:
+            raise ValueError(f"Image {image} does not fit into the dataset with shape {self.images.shape}")
+
+        entries = meta.sortedEntries()
+        if len(entries) > self.annotations.shape[1]:
+            raise ValueError(f"Dataset supports {self.annotations.shape[1]} objects, but got {len(entries)}")
+
+        for entry in entries:
+            if len(entry.name) > self.formNameLength:
+                raise ValueError(f"Form name {entry.name} is longer than {self.formNameLength} characters")
+
+        self.images[index] = image.buffer
+
+        annotations = self.annotations[index]
+        for slot, entry in enumerate(entries):
+            annotations[slot] = (
+                entry.name,
+                entry.boundingBox.topLeft[0],
+                entry.boundingBox.topLeft[1],
+                entry.boundingBox.width,
+                entry.boundingBox.height,
+                entry.z
+            )
+
+    def close(self):
+        """
+        @brief Close
+
+        Flushes the dataset to disk.
+        """
+        self.images.flush()
+        self.annotations.flush()
+        self.images = None
+        self.annotations = None
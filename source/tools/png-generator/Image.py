@@ -1,20 +1,27 @@
-import png
+import copy
+
+import numpy as np
 import sys
 
 from Color import Color
+from encoders.PyPng import PyPng
+from forms.Spans import Spans
 
 
 class Image:
     """
     @brief Image
 
-    Image class to create PNG files
+    Image class to create PNG files. The pixels are stored in a contiguous uint8 buffer with the shape
+    (height, width, channels), where channels is 3 for RGB and 1 for greyscale images. Monochrome images are
+    bit-packed with 8 pixels per byte into a buffer with the shape (height, ceil(width / 8)), like the rows
+    of a PNG file with a bit depth of 1.
 
     @author Philipp Koopke
     """
     
     def __init__(self, width=255, height=255, colorMode=Color.Mode.RGB, backColor=Color(0, 0, 0)):
-    	"""
+        """
         @brief Constructor
 
         Constructs the image with width of 255 Pixels, height of 255, colorMode in RGB and a black background Color
@@ -31,14 +38,14 @@ class Image:
         self.__height = height
         self.__colorMode = colorMode
 
+        if self.colorMode not in [Color.Mode.MONOCHROME, Color.Mode.GREYSCALE, Color.Mode.RGB]:
+            raise ValueError(f"Unknown color mode: {self.colorMode}")
+
         self.backColor = backColor
 
-        self.pixels = []
+        self.buffer = np.empty(Image.bufferShape(width, height, colorMode), dtype=np.uint8)
         self.clear()
 
-        if self.colorMode not in [Color.Mode.MONOCHROME, Color.Mode.GREYSCALE, Color.Mode.RGB]:
-            raise ValueError(f"Unknown color mode: {self.colorMode}")
-
     @property
     def width(self):
         """
@@ -75,6 +82,38 @@ class Image:
         
         return self.__colorMode
 
+    @staticmethod
+    def channels(mode):
+        """
+        @brief channels
+
+        returns the count of channels that a pixel requires in the color mode
+
+        @param mode is the color mode
+        """
+
+        if mode == Color.Mode.RGB:
+            return 3
+
+        return 1
+
+    @staticmethod
+    def bufferShape(width, height, mode):
+        """
+        @brief bufferShape
+
+        returns the shape of the pixel buffer of an image
+
+        @param width is the width of the image
+        @param height is the height of the image
+        @param mode is the color mode of the image
+        """
+
+        if mode == Color.Mode.MONOCHROME:
+            return height, (width + 7) // 8
+
+        return height, width, Image.channels(mode)
+
     def fill(self, color):
         """
         @brief fill
@@ -86,14 +125,11 @@ class Image:
         @author Philipp Koopke
         """
         
-        self.pixels = []
-
-        for y in range(self.height):
-            row = []
-            for x in range(self.width):
-                row.append(Color.SwapMode(color, self.colorMode))
-
-            self.pixels.append(row)
+        value = Color.SwapMode(color, self.colorMode).value
+        if self.colorMode == Color.Mode.MONOCHROME:
+            self.buffer[:] = 0xff * value
+        else:
+            self.buffer[:, :] = value
 
     def clear(self):
         """
@@ -106,6 +142,17 @@ class Image:
         
         self.fill(self.backColor)
 
+    def copy(self):
+        """
+        @brief copy
+
+        creates a new image with the same properties and a copy of the pixel buffer
+        """
+
+        image = copy.copy(self)
+        image.buffer = self.buffer.copy()
+        return image
+
     def setPixel(self, x, y, color):
         """
         @brief setPixel
@@ -119,73 +166,196 @@ class Image:
         @author Philipp Koopke
         """
         
-        if x not in range(self.width) or y not in range(self.height):
+        if not (0 <= x < self.width and 0 <= y < self.height):
             print(f"Pixel ({x}, {y}) is not in range({self.width}, {self.height}).")
             return
 
-        self.pixels[y][x] = Color.SwapMode(color, self.colorMode)
-
-    @staticmethod
-    def __newrow(mode):
+        value = Color.SwapMode(color, self.colorMode).value
+        if self.colorMode == Color.Mode.MONOCHROME:
+            bit = 0x80 >> (x % 8)
+            if value:
+                self.buffer[y, x // 8] |= bit
+            else:
+                self.buffer[y, x // 8] &= ~bit & 0xff
+        else:
+            self.buffer[y, x] = value
+
+    def getPixel(self, x, y):
         """
-        @brief __newrow
+        @brief getPixel
 
-        create a row of pixels 
+        returns one pixel of the Image as Color in the color mode of the image
         
-        @param mode ist the color mode for the row
-
-        @author ???
+        @param x is the x coord of the pixel
+        @param y is the y coord of the pixel
         """
         
-        if mode == Color.Mode.MONOCHROME or mode == Color.Mode.GREYSCALE:
-            return []
+        if self.colorMode == Color.Mode.MONOCHROME:
+            grey = ((int(self.buffer[y, x // 8]) >> (7 - x % 8)) & 1) * 255
+            return Color(grey, grey, grey, self.colorMode)
 
-        return ()
+        value = self.buffer[y, x]
+        if self.colorMode == Color.Mode.RGB:
+            return Color(int(value[0]), int(value[1]), int(value[2]), self.colorMode)
 
-    @staticmethod
-    def __newpng(width, height, mode):
+        grey = int(value[0])
+
+        return Color(grey, grey, grey, self.colorMode)
+
+    def pixelArray(self):
         """
-        @brief __newpng
+        @brief pixelArray
 
-        create an image with width, height and color mode
+        returns a copy of the pixels as array with the shape (height, width, channels). Monochrome pixels are
+        unpacked to 0 and 1.
+        """
         
-        @param width is the width of the image
-        @param height is the heigth the image
-        @param mode is the color mode of the image
+        if self.colorMode == Color.Mode.MONOCHROME:
+            return np.unpackbits(self.buffer, axis=1, count=self.width)[:, :, None]
 
-        @author ????
+        return self.buffer.copy()
+
+    def rows(self):
+        """
+        @brief rows
+
+        generator, which yields every row of the image as packed bytes, like they are stored in a PNG file.
+        The rows are taken from the buffer one at a time, monochrome rows are already packed.
         """
-        
-        if mode == Color.Mode.MONOCHROME:
-            return png.Writer(width, height, greyscale=True, bitdepth=1)
-        elif mode == Color.Mode.GREYSCALE:
-            return png.Writer(width, height, greyscale=True)
 
-        return png.Writer(width, height, greyscale=False)
+        for row in self.buffer:
+            yield row.tobytes()
 
-    def save(self, fileName):
-       """
+    def save(self, fileName, encoder=None):
+        """
         @brief save
 
-        save the pixels as PNG file with the fileName
+        save the pixels as PNG file with the fileName. The rows are streamed to the encoder, so no
+        second copy of the image is created.
         
         @param fileName is the name of the PNG file
+        @param encoder is the PNG encoder, which should be used. pypng is used by default.
 
         @author Philipp Koopke
         """
     
-        rawPixels = []
-        for y in range(self.height):
-            row = Image.__newrow(self.colorMode)
+        if encoder is None:
+            encoder = PyPng()
 
-            for x in range(self.width):
-                row = row + self.pixels[y][x].appendValue
+        with open(fileName, 'wb') as f:
+            encoder.write(f, self.width, self.height, self.colorMode, self.rows())
 
-            rawPixels.append(row)
+    def blitMask(self, offset, mask, colors):
+        """
+        @brief blitMask
 
-        with open(fileName, 'wb') as f:
-            w = Image.__newpng(self.width, self.height, self.colorMode)
-            w.write(f, rawPixels)
+        composites a whole mask into the image with one vectorized operation. Pixels outside of the image
+        are clipped. A boolean mask replaces the covered pixels, a coverage mask in range [0;1] blends the
+        colors over the current pixels.
+
+        @param offset is the position of the top left corner of the mask
+        @param mask is the boolean or coverage mask as numpy array with the shape (height, width) or the Spans
+        of a boolean mask, which are filled box by box
+        @param colors is either a single Color or an array of color values in the color mode of the image,
+        which can be broadcast to the shape (height, width, channels)
+        """
+
+        if isinstance(colors, Color):
+            colors = np.asarray(Color.SwapMode(colors, self.colorMode).appendValue, dtype=np.uint8)
+
+        maskHeight, maskWidth = mask.shape
+        left = max(0, offset[0])
+        top = max(0, offset[1])
+        right = min(self.width, offset[0] + maskWidth)
+        bottom = min(self.height, offset[1] + maskHeight)
+
+        if left >= right or top >= bottom:
+            return
+
+        region = (slice(top - offset[1], bottom - offset[1]), slice(left - offset[0], right - offset[0]))
+        mask = mask[region]
+        if colors.ndim == 3:
+            colors = colors[region]
+        else:
+            colors = np.broadcast_to(colors, mask.shape + colors.shape[-1:])
+
+        if self.colorMode == Color.Mode.MONOCHROME:
+            self.__blitPacked(left, top, mask.toMask() if isinstance(mask, Spans) else mask, colors)
+            return
+
+        target = self.buffer[top:bottom, left:right]
+        if isinstance(mask, Spans):
+            for spanTop, spanBottom, start, end in mask.boxes.tolist():
+                target[spanTop:spanBottom, start:end] = colors[spanTop:spanBottom, start:end]
+            return
+
+        if mask.dtype == np.bool_:
+            target[mask] = colors[mask]
+            return
+
+        covered = mask > 0
+        alpha = mask[covered][:, None]
+        blended = target[covered] * (1 - alpha) + colors[covered] * alpha
+        target[covered] = np.rint(blended).astype(np.uint8)
+
+    def __blitPacked(self, left, top, mask, colors):
+        """
+        @brief __blitPacked
+
+        composites a clipped mask into the bit-packed buffer of a monochrome image. Mask and colors are packed
+        into the bytes they touch, so the buffer itself is never unpacked. Coverage is thresholded at 0.5.
+
+        @param left is the x coord of the clipped mask
+        @param top is the y coord of the clipped mask
+        @param mask is the clipped mask
+        @param colors are the clipped colors with the shape (height, width, 1)
+        """
+
+        if mask.dtype != np.bool_:
+            mask = mask >= 0.5
+
+        height, width = mask.shape
+        shift = left % 8
+        firstByte = left // 8
+        lastByte = (left + width + 7) // 8
+
+        bits = np.zeros((height, (lastByte - firstByte) * 8), dtype=np.bool_)
+        bits[:, shift:shift + width] = mask
+        packedMask = np.packbits(bits, axis=1)
+
+        bits[:, shift:shift + width] = colors[:, :, 0] != 0
+        packedColors = np.packbits(bits, axis=1)
+
+        target = self.buffer[top:top + height, firstByte:lastByte]
+        target[:] = (target & ~packedMask) | (packedColors & packedMask)
+
+    @staticmethod
+    def shadeMask(form, generator, mask, colorMode, rows=slice(None)):
+        """
+        @brief shadeMask
+
+        calculates the color of every pixel, that is covered by the mask of the form
+
+        @param form is the form that the mask belongs to
+        @param generator is the color generator, which should be used
+        @param mask is the coverage mask of the form
+        @param colorMode is the color mode of the target image
+        @param rows is the slice of the mask rows, which are shaded. The colors are still spread over the whole mask.
+
+        @return Returns the colors as numpy array with the shape (rows, width, channels).
+        """
+
+        region = mask[rows, :]
+        first = rows.indices(mask.shape[0])[0]
+        colors = np.zeros(region.shape + (Image.channels(colorMode),), dtype=np.uint8)
+        # transformed forms have masks larger than the form, the colors are spread over the whole mask
+        dimension = (mask.shape[1], mask.shape[0])
+
+        # the coverage is applied by blitMask, so the generator provides the full color
+        ys, xs = region.nonzero()
+        colors[ys, xs] = generator.shade(xs, ys + first, np.ones(len(xs)), dimension, colorMode)
+
+        return colors
 
     def addForm(self, offset, form, generator):
         """
@@ -200,18 +370,8 @@ class Image:
         @author Philipp Koopke and Tarek Schwarzinger
         """
     
-        objPixelList = form.generate()
-
-        for pixel in objPixelList:
-            pos = (pixel[0], pixel[1])
-            dimension = (form.getWidth, form.getHeight)
-            progress = generator.progress(pos, dimension)
-
-            self.setPixel(
-                x=pixel[0] + offset[0],
-                y=pixel[1] + offset[1],
-                color=generator.getPixel(pixel[2], progress)
-            )
+        mask = form.mask()
+        self.blitMask(offset, mask, Image.shadeMask(form, generator, mask, self.colorMode))
 
     def __str__(self):
         """
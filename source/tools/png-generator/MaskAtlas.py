@@ -0,0 +1,227 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+import struct
+from abc import ABC
+
+import numpy as np
+
+from forms.Spans import Spans
+
+
+class MaskAtlas:
+    """
+    @brief Mask Atlas
+
+    Prerendered form masks in a single binary file, which is memory mapped, so every process, that uses the
+    same atlas, shares one physical copy of the masks. The file starts with a magic, the format version and the
+    length of a JSON index, followed by the index and the raw mask data. Every entry is keyed by the cache key of
+    its form and stores a hash of the source of the form classes, so masks of changed forms are ignored.
+    """
+
+    magic = b"PNGMASKS"
+    version = 2
+    alignment = 64
+    header = struct.Struct("<8sII")
+
+    __sourceHashes = {}
+
+    def __init__(self, fileName):
+        """
+        @brief Constructor
+
+        Memory maps an atlas file.
+
+        @param fileName The file name of the atlas.
+
+        @attention If the file is no atlas or has another format version, a ValueError will be raised.
+        """
+        self.fileName = fileName
+        self.data = np.memmap(fileName, dtype=np.uint8, mode="r")
+
+        if len(self.data) < MaskAtlas.header.size:
+            raise ValueError(f"{fileName} is no mask atlas")
+
+        magic, version, indexLength = MaskAtlas.header.unpack(self.data[:MaskAtlas.header.size].tobytes())
+        if magic != MaskAtlas.magic:
+            raise ValueError(f"{fileName} is no mask atlas")
+        if version != MaskAtlas.version:
+            raise ValueError(f"Mask atlas {fileName} has version {version}, but version {MaskAtlas.version} is required, please rebuild it")
+
+        start = MaskAtlas.header.size
+        index = json.loads(self.data[start:start + indexLength].tobytes().decode("utf-8"))
+        self.dataStart = MaskAtlas.dataOffset(indexLength)
+        self.hashes = index["hashes"]
+        self.entries = {tuple(entry["key"]): entry for entry in index["entries"]}
+        self.valid = {}
+
+    @staticmethod
+    def dataOffset(indexLength):
+        """
+        @brief Data offset
+
+        @param indexLength The length of the JSON index in bytes.
+
+        @return Returns the offset of the mask data in the file, which follows the aligned index.
+        """
+        return -(-(MaskAtlas.header.size + indexLength) // MaskAtlas.alignment) * MaskAtlas.alignment
+
+    @staticmethod
+    def Dependencies():
+        """
+        @brief Dependencies
+
+        @return Returns the sorted source files, which every mask depends on besides the form classes: the
+        rasterizer backends and the spans.
+        """
+        directory = os.path.dirname(os.path.abspath(__file__))
+        return [os.path.join(directory, "forms", "Spans.py")] + sorted(glob.glob(os.path.join(directory, "rasterizers", "*.py")))
+
+    @staticmethod
+    def SourceHash(formClass):
+        """
+        @brief Source hash
+
+        Hashes the source files of a form class, all of its base classes and the dependencies of the masks.
+
+        @param formClass The class of the form.
+
+        @return Returns the hash as hex string.
+        """
+        sourceHash = MaskAtlas.__sourceHashes.get(formClass)
+        if sourceHash is not None:
+            return sourceHash
+
+        fileNames = [inspect.getsourcefile(baseClass) for baseClass in formClass.__mro__ if baseClass not in (object, ABC)]
+
+        digest = hashlib.sha256()
+        for fileName in fileNames + MaskAtlas.Dependencies():
+            with open(fileName, "rb") as f:
+                digest.update(f.read())
+
+        sourceHash = digest.hexdigest()
+        MaskAtlas.__sourceHashes[formClass] = sourceHash
+        return sourceHash
+
+    @staticmethod
+    def ClassName(formClass):
+        """
+        @brief Class name
+
+        @param formClass The class of the form.
+
+        @return Returns the qualified name of the form class, that is stored in the atlas.
+        """
+        return f"{formClass.__module__}.{formClass.__qualname__}"
+
+    @staticmethod
+    def Key(cacheKey):
+        """
+        @brief Key
+
+        Converts the cache key of a form into the key of the atlas.
+
+        @param cacheKey The cache key as returned by Form.cacheKey.
+
+        @return Returns the key as tuple of JSON compatible values.
+        """
+        formClass, width, height, antiAliasing = cacheKey[:4]
+        return MaskAtlas.ClassName(formClass), int(width), int(height), bool(antiAliasing), repr(cacheKey[4:])
+
+    @staticmethod
+    def Write(fileName, masks):
+        """
+        @brief Write
+
+        Writes an atlas file.
+
+        @param fileName The file name of the atlas.
+        @param masks A dictionary of masks by the cache keys of their forms. Masks are either numpy arrays or Spans.
+        """
+        hashes = {}
+        entries = []
+        blobs = []
+        offset = 0
+
+        for cacheKey, mask in masks.items():
+            key = MaskAtlas.Key(cacheKey)
+            hashes[key[0]] = MaskAtlas.SourceHash(cacheKey[0])
+
+            if isinstance(mask, Spans):
+                blob = np.ascontiguousarray(mask.boxes)
+                entry = {"kind": "spans", "maskShape": list(mask.shape)}
+            else:
+                blob = np.ascontiguousarray(mask)
+                entry = {"kind": "dense"}
+
+            entry.update({"key": list(key), "dtype": blob.dtype.str, "shape": list(blob.shape), "offset": offset})
+            entries.append(entry)
+            blobs.append(blob)
+
+            offset += -(-blob.nbytes // MaskAtlas.alignment) * MaskAtlas.alignment
+
+        index = json.dumps({"hashes": hashes, "entries": entries}).encode("utf-8")
+        dataStart = MaskAtlas.dataOffset(len(index))
+
+        with open(fileName, "wb") as f:
+            f.write(MaskAtlas.header.pack(MaskAtlas.magic, MaskAtlas.version, len(index)))
+            f.write(index)
+            f.write(bytes(dataStart - f.tell()))
+
+            for entry, blob in zip(entries, blobs):
+                f.write(bytes(dataStart + entry["offset"] - f.tell()))
+                f.write(blob.tobytes())
+
+    def get(self, cacheKey):
+        """
+        @brief Get
+
+        Looks up a mask.
+
+        @param cacheKey The cache key as returned by Form.cacheKey.
+
+        @return Returns the read-only mask, that is mapped from the file, or None, if the atlas has no mask for the
+        key or the source of the form has changed since the atlas was built.
+        """
+        # only masks of forms are stored, other cached arrays, like distance fields, have keys of another shape
+        if not isinstance(cacheKey[0], type):
+            return None
+
+        key = MaskAtlas.Key(cacheKey)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        valid = self.valid.get(key[0])
+        if valid is None:
+            valid = self.hashes.get(key[0]) == MaskAtlas.SourceHash(cacheKey[0])
+            self.valid[key[0]] = valid
+
+        if not valid:
+            return None
+
+        dtype = np.dtype(entry["dtype"])
+        start = self.dataStart + entry["offset"]
+        count = int(np.prod(entry["shape"]))
+        array = self.data[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+
+        if entry["kind"] == "spans":
+            return Spans(array, entry["maskShape"])
+
+        return array
+
+    def __len__(self):
+        """
+        @brief Length
+
+        @return Returns the count of masks in the atlas.
+        """
+        return len(self.entries)
+
+    def __str__(self):
+        """
+        @brief To string
+        """
+        return f"MaskAtlas(file: {self.fileName}, masks: {len(self.entries)})"
@@ -10,6 +10,9 @@ class Meta:
 
     @author Philipp Koopke
     """
+	# size of the cells of the grid in pixels
+	cellSize = 64
+
 	class Entry:
 		"""
     	@brief Entry
@@ -43,31 +46,66 @@ class Meta:
 	    @author Philipp Koopke
 	    """	
 		self.entries = []
+		# uniform grid of the entries by the cells, that their bounding boxes cover
+		self.cells = {}
+
+	@staticmethod
+	def cellsOf(boundingBox):
+		"""
+		@brief cellsOf
+
+		returns the keys of all grid cells, that the boundingBox covers. The corners are inclusive, so touching
+		bounding boxes share a cell.
+
+		@param boundingBox is the boundingBox whose cells are returned
+		"""
+		left, top = boundingBox.topLeft
+		right, bottom = boundingBox.bottomRight
+
+		return [(column, row)
+				for row in range(int(top) // Meta.cellSize, int(bottom) // Meta.cellSize + 1)
+				for column in range(int(left) // Meta.cellSize, int(right) // Meta.cellSize + 1)]
 
 	def addEntry(self, entry):
 		"""
         @brief addEntry
 
-        add an entry in entries
+        add an entry in entries and in the grid cells of its boundingBox
         
         @param entry is the entry which will be added to the list
 
         @author Philipp Koopke
         """
 		self.entries.append(entry)
+		for cell in Meta.cellsOf(entry.boundingBox):
+			self.cells.setdefault(cell, []).append(entry)
 
 	def isOverlapping(self, boundingBox):
 		"""
         @brief isOverlapping
 
-        check if the boundingBox overlaps with an boundingBox in the entries
+        check if the boundingBox overlaps with an boundingBox in the entries. Only the entries in the grid cells
+        of the boundingBox are checked, until the first overlapping one is found.
         
         @param boundingBox is the boundingBox which will be chekced against the entries
 
         @author Philipp Koopke
         """
-		overlaps = [int(boundingBox.isOverlapping(entry.boundingBox)) for entry in self.entries]
-		return sum(overlaps) >= 1
+		for cell in Meta.cellsOf(boundingBox):
+			for entry in self.cells.get(cell, ()):
+				if boundingBox.isOverlapping(entry.boundingBox):
+					return True
+
+		return False
+
+	def sortedEntries(self):
+		"""
+        @brief sortedEntries
+
+        returns the list of entries in the order, in which they are stored
+        """
+		# in progress: sort
+		return sorted(self.entries, key=cmp_to_key(Meta.compare ) )
 
 	def save(self, filename):
 		"""
@@ -84,10 +122,7 @@ class Meta:
 			'forms': []
 		}
 
-		# in progress: sort
-		sortedMeta = sorted(self.entries, key=cmp_to_key(Meta.compare ) )
-		
-		for entry in sortedMeta:
+		for entry in self.sortedEntries():
 			data['forms'].append({
 				'formName': entry.name,
 				'position': {
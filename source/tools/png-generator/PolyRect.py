@@ -5,5 +5,5 @@ class PolyRect(PolygonForm):
     def __init__(self):
         PolygonForm.__init__(self, 10)
 
-    def generate(self):
-        return self.generatePolygon([(0, 0), (1, 0), (1, 1), (0, 1)])
\ No newline at end of file
+    def templates(self):
+        return [[(0, 0), (1, 0), (1, 1), (0, 1)]]
\ No newline at end of file
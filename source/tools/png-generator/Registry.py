@@ -0,0 +1,200 @@
+import importlib
+import os
+from functools import partial
+
+
+class Registry:
+    """
+    @brief Registry
+
+    Registry of the forms or color generators of the generator. The modules of the package directory next to
+    this file and the entry points of plugin packages are discovered once per process, but a module is only
+    imported, when its class is used for the first time. Every class is instantiated once.
+    """
+
+    __discovered = {}
+
+    def __init__(self, package, group=None, blacklist=None, onLoad=None):
+        """
+        @brief Constructor
+
+        Constructs an empty registry.
+
+        @param package The name of the package, whose modules contain one class with the name of the module.
+        @param group The entry point group of plugin packages, e.g. png_generator.forms.
+        @param blacklist The list of names, which are not registered. The list is shared, not copied.
+        @param onLoad The function, which is called with the name and the instance after a class was loaded.
+        """
+        self.package = package
+        self.directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), package)
+        self.group = group
+        self.blacklist = blacklist if blacklist is not None else []
+        self.onLoad = onLoad
+        self.loaders = {}
+        self.instances = {}
+
+    @staticmethod
+    def Locate(package, name):
+        """
+        @brief Locate
+
+        Imports the module \p name of the package.
+
+        @param package The name of the package.
+        @param name The name of the module and its class.
+
+        @return Returns the class.
+        """
+        return getattr(importlib.import_module(f"{package}.{name}"), name)
+
+    @staticmethod
+    def EntryPoints(group):
+        """
+        @brief Entry points
+
+        @param group The entry point group.
+
+        @return Returns the installed entry points of the group.
+        """
+        if group is None:
+            return []
+
+        # importlib.metadata is imported on demand, it takes longer to import than the whole registry
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return []
+
+        points = entry_points()
+        if hasattr(points, "select"):
+            return list(points.select(group=group))
+
+        return list(points.get(group, []))
+
+    @staticmethod
+    def Discover(directory, package, group):
+        """
+        @brief Discover
+
+        Lists the modules of a package directory and the entry points of a group without importing them.
+        The result is cached.
+
+        @param directory The directory of the package.
+        @param package The name of the package.
+        @param group The entry point group.
+
+        @return Returns a list of tuples of the name and a function, which imports and returns the class.
+        """
+        key = (directory, package, group)
+        discovered = Registry.__discovered.get(key)
+        if discovered is not None:
+            return discovered
+
+        names = sorted(file[:-len(".py")] for file in os.listdir(directory) if file.endswith(".py"))
+        discovered = [(name, partial(Registry.Locate, package, name)) for name in names]
+        discovered += [(point.name, point.load) for point in Registry.EntryPoints(group)]
+
+        Registry.__discovered[key] = discovered
+        return discovered
+
+    def scan(self):
+        """
+        @brief Scan
+
+        Registers all discovered classes, that are not blacklisted.
+
+        @return Returns the names of the registered classes.
+        """
+        return [name for name, loader in Registry.Discover(self.directory, self.package, self.group)
+                if self.add(name, loader)]
+
+    def add(self, name, loader):
+        """
+        @brief Add
+
+        Registers a class.
+
+        @param name The name of the class.
+        @param loader The function, which returns the class.
+
+        @return Returns False, if the name is blacklisted, otherwise True.
+        """
+        if name in self.blacklist:
+            return False
+
+        self.loaders[name] = loader
+        self.instances.pop(name, None)
+        return True
+
+    def keys(self):
+        """
+        @brief Keys
+
+        @return Returns the names of all registered classes in the order of their registration.
+        """
+        return list(self.loaders.keys())
+
+    def __getitem__(self, name):
+        """
+        @brief Get item
+
+        Imports and instantiates the class on its first use.
+
+        @param name The name of the class.
+
+        @return Returns the instance of the class.
+        """
+        instance = self.instances.get(name)
+        if instance is None:
+            instance = self.loaders[name]()()
+            self.instances[name] = instance
+            if self.onLoad is not None:
+                self.onLoad(name, instance)
+
+        return instance
+
+    def values(self):
+        """
+        @brief Values
+
+        @return Returns the instances of all registered classes, which are loaded if necessary.
+        """
+        return [self[name] for name in self.loaders]
+
+    def items(self):
+        """
+        @brief Items
+
+        @return Returns tuples of the name and the instance of all registered classes.
+        """
+        return [(name, self[name]) for name in self.loaders]
+
+    def loaded(self):
+        """
+        @brief Loaded
+
+        @return Returns tuples of the name and the instance of the classes, that are already loaded.
+        """
+        return list(self.instances.items())
+
+    def __contains__(self, name):
+        """
+        @brief Contains
+
+        @return Returns True, if a class with the name is registered.
+        """
+        return name in self.loaders
+
+    def __len__(self):
+        """
+        @brief Length
+
+        @return Returns the count of registered classes.
+        """
+        return len(self.loaders)
+
+    def __str__(self):
+        """
+        @brief To string
+        """
+        return f"Registry(package: {self.package}, classes: {self.keys()}, loaded: {list(self.instances.keys())})"
@@ -0,0 +1,190 @@
+import copy
+from itertools import islice
+
+from Color import Color
+from Image import Image
+from encoders.PyPng import PyPng
+
+
+class TiledImage:
+    """
+    @brief Tiled Image
+
+    Image, which is rendered in horizontal bands while it is saved. Forms are only recorded when they are added.
+    Right before a band is streamed into the encoder, the forms it intersects are shaded and composited, but
+    only the rows of the band. Besides the masks in the mask cache, the pixel memory is limited to one band of
+    width x bandHeight pixels and the colors of one form in the band, no matter how tall the image is.
+    """
+
+    def __init__(self, width=255, height=255, colorMode=Color.Mode.RGB, backColor=Color(0, 0, 0), bandHeight=64):
+        """
+        @brief Constructor
+
+        Constructs the tiled image.
+
+        @param width The width of the image.
+        @param height The height of the image.
+        @param colorMode The color mode of the image, can be monochrome, greyscale or RGB.
+        @param backColor The background color of the image.
+        @param bandHeight The count of rows, which are rendered at once.
+
+        @attention If the band height is not positive, a ValueError will be raised.
+        """
+        if bandHeight < 1:
+            raise ValueError(f"Band height has to be at least 1, but got {bandHeight}")
+
+        self.__width = width
+        self.__height = height
+        self.__colorMode = colorMode
+        self.__bandHeight = bandHeight
+
+        self.backColor = backColor
+        self.bands = [[] for _ in range((height + bandHeight - 1) // bandHeight)]
+
+    @property
+    def width(self):
+        """
+        @brief Width
+
+        @return Returns the width of the image.
+        """
+        return self.__width
+
+    @property
+    def height(self):
+        """
+        @brief Height
+
+        @return Returns the height of the image.
+        """
+        return self.__height
+
+    @property
+    def colorMode(self):
+        """
+        @brief Color mode
+
+        @return Returns the color mode of the image.
+        """
+        return self.__colorMode
+
+    @property
+    def bandHeight(self):
+        """
+        @brief Band height
+
+        @return Returns the count of rows, which are rendered at once.
+        """
+        return self.__bandHeight
+
+    def intersectingBands(self, offset, shape):
+        """
+        @brief Intersecting bands
+
+        @param offset The position of the top left corner of a mask.
+        @param shape The shape of the mask.
+
+        @return Returns the range of the bands, which the mask intersects.
+        """
+        top = max(0, offset[1])
+        bottom = min(self.height, offset[1] + shape[0])
+        if top >= bottom or offset[0] >= self.width or offset[0] + shape[1] <= 0:
+            return range(0)
+
+        return range(top // self.bandHeight, (bottom - 1) // self.bandHeight + 1)
+
+    def blitMask(self, offset, mask, colors):
+        """
+        @brief Blit mask
+
+        Adds the mask to every band it intersects. The arguments are the same as for Image.blitMask. The mask
+        and the colors are kept until the image is saved.
+
+        @param offset The position of the top left corner of the mask.
+        @param mask The boolean or coverage mask.
+        @param colors A single Color or an array of color values in the color mode of the image.
+        """
+        for band in self.intersectingBands(offset, mask.shape):
+            self.bands[band].append((offset, mask, colors, None, None))
+
+    def addForm(self, offset, form, generator):
+        """
+        @brief Add form
+
+        Records the form and the color generator in the bands it intersects. Forms and color generators are
+        shared between objects, so copies of their current state are recorded. The mask is taken from the mask
+        cache again and only the rows of a band are shaded, when the band is rendered.
+
+        @param offset The position, where to insert the form.
+        @param form The form to be added to the image.
+        @param generator The color generator, which should be used.
+        """
+        bands = self.intersectingBands(offset, form.mask().shape)
+        if len(bands) == 0:
+            return
+
+        form = copy.copy(form)
+        generator = copy.copy(generator)
+        generator.colors = list(generator.colors)
+
+        for band in bands:
+            self.bands[band].append((offset, None, None, form, generator))
+
+    def render(self, band):
+        """
+        @brief Render
+
+        Renders a band.
+
+        @param band The index of the band.
+
+        @return Returns the band as Image with the height bandHeight.
+        """
+        top = band * self.bandHeight
+        image = Image(self.width, self.bandHeight, self.colorMode, self.backColor)
+
+        for offset, mask, colors, form, generator in self.bands[band]:
+            if form is None:
+                image.blitMask((offset[0], offset[1] - top), mask, colors)
+                continue
+
+            mask = form.mask()
+            rows = slice(max(0, top - offset[1]), max(0, top + self.bandHeight - offset[1]))
+            colors = Image.shadeMask(form, generator, mask, self.colorMode, rows)
+            image.blitMask((offset[0], offset[1] + rows.start - top), mask[rows, :], colors)
+
+        return image
+
+    def rows(self):
+        """
+        @brief Rows
+
+        Generator, which renders one band at a time and yields its rows as packed bytes. Every rendered band
+        is released afterwards, the recorded forms are kept, so the image can be saved again.
+        """
+        for band in range(len(self.bands)):
+            top = band * self.bandHeight
+            yield from islice(self.render(band).rows(), min(self.bandHeight, self.height - top))
+
+    def save(self, fileName, encoder=None):
+        """
+        @brief Save
+
+        Renders the image band by band and streams it into the PNG file.
+
+        @param fileName The name of the PNG file.
+        @param encoder The PNG encoder, which should be used. pypng is used by default.
+        """
+        if encoder is None:
+            encoder = PyPng()
+
+        with open(fileName, 'wb') as f:
+            encoder.write(f, self.width, self.height, self.colorMode, self.rows())
+
+    def __str__(self):
+        """
+        @brief String conversion
+
+        @return Converts the tiled image to a string representation.
+        """
+        return f"TiledImage(width: {self.width}, height:{self.height}, colorMode: {Color.ModeString(self.colorMode)}, bandHeight: {self.bandHeight})"
@@ -1,3 +1,5 @@
+import numpy as np
+
 from Color import Color
 
 
@@ -66,10 +68,48 @@ class ColorGenerator:
             current[1]/total[1]
         )
 
+    def values(self, progressX, progressY):
+        # RGB values of the pixels with the progress arrays as float array with the shape (N, 3)
+        color = self.__getColor((1, 1))
+        return np.tile(np.array([color.r, color.g, color.b]), (len(progressX), 1))
+
+    @staticmethod
+    def truncate(values):
+        # like the constructor of Color: clamped and truncated
+        return np.clip(values, 0, 255).astype(np.int64)
+
+    @staticmethod
+    def convertValues(values, mode):
+        # like Color.convert for arrays of integer RGB values with the shape (N, 3)
+        if mode == Color.Mode.RGB:
+            return values.astype(np.uint8)
+
+        grey = (0.3 * values[:, 0] + 0.59 * values[:, 1] + 0.11 * values[:, 2]).astype(np.int64)
+        if mode == Color.Mode.GREYSCALE:
+            return grey.astype(np.uint8)[:, None]
+        elif mode == Color.Mode.MONOCHROME:
+            return (grey >= 128).astype(np.uint8)[:, None]
+
+        raise ValueError(f"Invalid color mode {mode} found")
+
+    def shade(self, xs, ys, intensities, dimension, mode=Color.Mode.RGB):
+        # xs, ys: pixel positions in a form with the size dimension tuple(width, height)
+        # intensities [0;1] per pixel
+        # returns the colors of all pixels in the color mode as uint8 array with the shape (N, channels)
+        progressX = np.asarray(xs, dtype=np.float64) / dimension[0]
+        progressY = np.asarray(ys, dtype=np.float64) / dimension[1]
+
+        # the colors are converted to integers before they are scaled, like the colors of getPixel
+        values = self.truncate(self.values(progressX, progressY))
+        values = self.truncate(values * np.asarray(intensities, dtype=np.float64)[:, None])
+        return self.convertValues(values, mode)
+
     def getPixel(self, intensity, progress=(1, 1)):
         # intensity [0;1]
         # progress tuple(horizontal, vertical) für gradient
-        return self.scale(self.__getColor(progress), intensity)
+        # compatibility for single pixels, the progress is the position in a form of the size 1 x 1
+        r, g, b = self.shade([progress[0]], [progress[1]], [intensity], (1, 1))[0]
+        return Color(int(r), int(g), int(b))
 
     def newForm(self):
         pass
@@ -1,10 +1,99 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
 from colors.ColorGenerator import ColorGenerator
+from Color import Color
+
 
+class Gradient(ColorGenerator, ABC):
+    # lookup tables by endpoints, size and color mode, shared by all gradients
+    tables = {}
+    tableLimit = 1024
 
-class Gradient(ColorGenerator):
     def __init__(self):
         ColorGenerator.__init__(self)
+        # entries of the lookup table of the progress, 0 calculates every pixel exactly
+        self.tableSize = 0
+        self.__tables = {}
 
     @staticmethod
     def colorsRequired():
         return 2
+
+    def clearColors(self):
+        ColorGenerator.clearColors(self)
+        self.__tables = {}
+
+    def addColor(self, color):
+        ColorGenerator.addColor(self, color)
+        self.__tables = {}
+        if self.tableSize > 0 and len(self.colors) == self.colorsRequired():
+            self.lookupTable(Color.Mode.RGB)
+
+    def reset(self):
+        ColorGenerator.reset(self)
+        self.__tables = {}
+
+    @staticmethod
+    def lerpValues(alpha, minColor, maxColor):
+        # like ColorGenerator.lerp of two colors for an array of alphas, returns float RGB values with the shape (N, 3)
+        alpha = np.clip(alpha, 0, 1)[:, None]
+        minValues = np.array([minColor.r, minColor.g, minColor.b])
+        maxValues = np.array([maxColor.r, maxColor.g, maxColor.b])
+        return minValues + ((maxValues - minValues) * alpha)
+
+    @abstractmethod
+    def progressValues(self, progressX, progressY):
+        # the progress of the gradient for the progress of every pixel in the form, clamped by lerpValues
+        pass
+
+    def values(self, progressX, progressY):
+        if len(self.colors) < self.colorsRequired():
+            raise ValueError(f"Only got {len(self.colors)} colors, but requires {self.colorsRequired()} colors")
+
+        return Gradient.lerpValues(self.progressValues(progressX, progressY), self.colors[0], self.colors[1])
+
+    def lookupTable(self, mode):
+        # the colors of tableSize equidistant progresses in [0;1] as uint8 array with the shape (tableSize, channels)
+        table = self.__tables.get(mode)
+        if table is not None:
+            return table
+
+        if len(self.colors) < self.colorsRequired():
+            raise ValueError(f"Only got {len(self.colors)} colors, but requires {self.colorsRequired()} colors")
+
+        # gradients with the same endpoints share their tables
+        minColor, maxColor = self.colors[0], self.colors[1]
+        key = ((minColor.r, minColor.g, minColor.b), (maxColor.r, maxColor.g, maxColor.b), self.tableSize, mode)
+        table = Gradient.tables.get(key)
+        if table is None:
+            if len(Gradient.tables) >= Gradient.tableLimit:
+                Gradient.tables.clear()
+
+            alpha = np.linspace(0, 1, self.tableSize)
+            table = self.convertValues(self.truncate(Gradient.lerpValues(alpha, minColor, maxColor)), mode)
+            table.setflags(write=False)
+            Gradient.tables[key] = table
+
+        self.__tables[mode] = table
+        return table
+
+    def shade(self, xs, ys, intensities, dimension, mode=Color.Mode.RGB):
+        if self.tableSize <= 0:
+            return ColorGenerator.shade(self, xs, ys, intensities, dimension, mode)
+
+        progressX = np.asarray(xs, dtype=np.float64) / dimension[0]
+        progressY = np.asarray(ys, dtype=np.float64) / dimension[1]
+
+        # the progress is quantized to the nearest entry of the table
+        progress = np.clip(self.progressValues(progressX, progressY), 0, 1)
+        index = np.rint(progress * (self.tableSize - 1)).astype(np.intp)
+
+        intensities = np.asarray(intensities, dtype=np.float64)
+        if np.all(intensities == 1):
+            return self.lookupTable(mode)[index]
+
+        # scaled colors are converted after the scaling, like ColorGenerator.shade
+        values = self.lookupTable(Color.Mode.RGB)[index].astype(np.int64)
+        return self.convertValues(self.truncate(values * intensities[:, None]), mode)
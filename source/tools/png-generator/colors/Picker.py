@@ -1,6 +1,9 @@
-from colors.ColorGenerator import ColorGenerator
 import random
 
+import numpy as np
+
+from colors.ColorGenerator import ColorGenerator
+
 
 class Picker(ColorGenerator):
     def __init__(self):
@@ -11,16 +14,11 @@ class Picker(ColorGenerator):
         # Infinite amount
         return -1
 
-    def __getColor(self, progress):
+    def values(self, progressX, progressY):
         if self.color is None:
             self.newForm()
 
-        return self.color
-
-    def getPixel(self, intensity, progress=(1, 1)):
-        # intensity [0;1]
-        # progress tuple(horizontal, vertical) für gradient
-        return ColorGenerator.scale(self.__getColor(progress), intensity)
+        return np.tile(np.array([self.color.r, self.color.g, self.color.b]), (len(progressX), 1))
 
     def newForm(self):
         if len(self.colors) == 0:
@@ -1,8 +1,6 @@
-import math
+import numpy as np
 
 from colors.Gradient import Gradient
-from colors.ColorGenerator import ColorGenerator
-from Color import Color
 
 
 class RadialGradient(Gradient):
@@ -11,19 +9,8 @@ class RadialGradient(Gradient):
         self.center = center
         self.progressScale = progressScale
 
-    def __getColor(self, progress):
-        if len(self.colors) < self.colorsRequired():
-            raise ValueError(f"Only got {len(self.colors)} colors, but requires {self.colorsRequired()} colors")
-        
-        direction = (
-            self.center[0] - progress[0],
-            self.center[1] - progress[1]
-        )
+    def progressValues(self, progressX, progressY):
+        directionX = self.center[0] - progressX
+        directionY = self.center[1] - progressY
 
-        distance = math.sqrt(direction[0]*direction[0] + direction[1]*direction[1]) * self.progressScale
-        return self.lerp(distance, self.colors[0], self.colors[1])
-
-    def getPixel(self, intensity, progress=(1, 1)):
-        # intensity [0;1]
-        # progress tuple(horizontal, vertical) für gradient
-        return ColorGenerator.scale(self.__getColor(progress), intensity)
+        return np.sqrt(directionX*directionX + directionY*directionY) * self.progressScale
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+
+from Color import Color
+
+
+class Encoder(ABC):
+    """
+    @brief Encoder
+
+    Base class for all PNG encoders. An encoder receives the rows of an image as packed bytes, like they are
+    stored in a PNG file, and writes the PNG file.
+    """
+
+    filters = ["none", "sub", "up", "paeth", "adaptive"]
+
+    def __init__(self, compression=None, filter="adaptive"):
+        """
+        @brief Constructor
+
+        @param compression The zlib compression level from 0 to 9. None uses the zlib default.
+        @param filter The PNG row filter. Available filters are none, sub, up, paeth and adaptive.
+
+        @attention If the compression level or the filter is unknown, a ValueError will be raised.
+        """
+        if compression is not None and compression not in range(10):
+            raise ValueError(f"Compression level has to be in range from 0 to 9, but got {compression}")
+
+        if filter not in Encoder.filters:
+            raise ValueError(f"Unknown PNG filter {filter}")
+
+        self.compression = compression
+        self.filter = filter
+
+    @property
+    def level(self):
+        """
+        @brief zlib level
+
+        @return Returns the compression level as expected by zlib.
+        """
+        if self.compression is None:
+            return -1
+
+        return self.compression
+
+    @staticmethod
+    def bitDepth(colorMode):
+        """
+        @brief Bit depth
+
+        @param colorMode The color mode of the image.
+
+        @return Returns the bit depth of one channel in the color mode.
+        """
+        if colorMode == Color.Mode.MONOCHROME:
+            return 1
+
+        return 8
+
+    @abstractmethod
+    def write(self, file, width, height, colorMode, rows):
+        """
+        @brief Write
+
+        Writes a PNG file.
+
+        @param file The binary file object the PNG is written to.
+        @param width The width of the image.
+        @param height The height of the image.
+        @param colorMode The color mode of the image.
+        @param rows Iterable, which yields every row of the image as packed bytes.
+        """
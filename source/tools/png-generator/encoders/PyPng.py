@@ -0,0 +1,43 @@
+import png
+
+from encoders.Encoder import Encoder
+from Color import Color
+
+
+class PyPng(Encoder):
+    """
+    @brief PyPng
+
+    Encoder, which uses pypng to write the PNG file. pypng does not filter the rows, so the filter setting
+    is ignored.
+    """
+
+    def __init__(self, compression=None, filter="none"):
+        """
+        @brief Constructor
+
+        @param compression The zlib compression level from 0 to 9. None uses the zlib default.
+        @param filter The PNG row filter, which is ignored by this encoder.
+        """
+        Encoder.__init__(self, compression, filter)
+
+    def write(self, file, width, height, colorMode, rows):
+        """
+        @brief Write
+
+        Writes a PNG file with pypng.
+
+        @param file The binary file object the PNG is written to.
+        @param width The width of the image.
+        @param height The height of the image.
+        @param colorMode The color mode of the image.
+        @param rows Iterable, which yields every row of the image as packed bytes.
+        """
+        writer = png.Writer(
+            width,
+            height,
+            greyscale=colorMode != Color.Mode.RGB,
+            bitdepth=Encoder.bitDepth(colorMode),
+            compression=self.compression
+        )
+        writer.write_packed(file, rows)
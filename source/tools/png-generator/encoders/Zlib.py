@@ -0,0 +1,159 @@
+import struct
+import zlib
+
+import numpy as np
+
+from encoders.Encoder import Encoder
+from Color import Color
+
+
+class Zlib(Encoder):
+    """
+    @brief Zlib
+
+    Encoder, which filters blocks of rows with vectorized numpy operations and feeds them directly into zlib.
+    The adaptive filter chooses the filter with the lowest sum of absolute differences for every row.
+    """
+
+    signature = b"\x89PNG\r\n\x1a\n"
+    filterTypes = {"none": 0, "sub": 1, "up": 2, "paeth": 4}
+
+    def __init__(self, compression=None, filter="adaptive", blockHeight=256, chunkLimit=2 ** 20):
+        """
+        @brief Constructor
+
+        @param compression The zlib compression level from 0 to 9. None uses the zlib default.
+        @param filter The PNG row filter. Available filters are none, sub, up, paeth and adaptive.
+        @param blockHeight The count of rows that are filtered together.
+        @param chunkLimit The size in bytes, after which the compressed data is written as IDAT chunk.
+        """
+        Encoder.__init__(self, compression, filter)
+        self.blockHeight = blockHeight
+        self.chunkLimit = chunkLimit
+
+    @staticmethod
+    def writeChunk(file, tag, data):
+        """
+        @brief Write chunk
+
+        Writes a single PNG chunk with its length and checksum.
+
+        @param file The binary file object the chunk is written to.
+        @param tag The chunk type as bytes.
+        @param data The data of the chunk as bytes.
+        """
+        file.write(struct.pack("!I", len(data)))
+        file.write(tag)
+        file.write(data)
+        file.write(struct.pack("!I", zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff))
+
+    @staticmethod
+    def filterBlock(block, previous, pixelSize, filterName):
+        """
+        @brief Filter block
+
+        Filters a block of rows.
+
+        @param block The rows as uint8 array with the shape (rows, bytes per row).
+        @param previous The row above the block as uint8 array. Zeros for the first block.
+        @param pixelSize The count of bytes per pixel, at least 1.
+        @param filterName The filter, which shall be applied.
+
+        @return Returns the filtered rows as uint8 array, which starts with the filter type of every row.
+        """
+        current = block.astype(np.int16)
+        up = np.vstack((previous[None, :], block[:-1])).astype(np.int16)
+
+        left = np.zeros_like(current)
+        left[:, pixelSize:] = current[:, :-pixelSize]
+        upLeft = np.zeros_like(up)
+        upLeft[:, pixelSize:] = up[:, :-pixelSize]
+
+        candidates = {}
+        if filterName in ["none", "adaptive"]:
+            candidates["none"] = current
+        if filterName in ["sub", "adaptive"]:
+            candidates["sub"] = current - left
+        if filterName in ["up", "adaptive"]:
+            candidates["up"] = current - up
+        if filterName in ["paeth", "adaptive"]:
+            estimate = left + up - upLeft
+            distanceLeft = np.abs(estimate - left)
+            distanceUp = np.abs(estimate - up)
+            distanceUpLeft = np.abs(estimate - upLeft)
+            predictor = np.where(
+                (distanceLeft <= distanceUp) & (distanceLeft <= distanceUpLeft),
+                left,
+                np.where(distanceUp <= distanceUpLeft, up, upLeft)
+            )
+            candidates["paeth"] = current - predictor
+
+        names = list(candidates.keys())
+        filtered = np.stack([candidates[name] for name in names]).astype(np.uint8)
+
+        if len(names) == 1:
+            choice = np.zeros(block.shape[0], dtype=np.intp)
+        else:
+            # minimum sum of absolute differences, with the filtered bytes treated as signed values
+            costs = np.abs(filtered.view(np.int8).astype(np.int32)).sum(axis=2)
+            choice = np.argmin(costs, axis=0)
+
+        rows = filtered[choice, np.arange(block.shape[0])]
+        types = np.asarray([Zlib.filterTypes[name] for name in names], dtype=np.uint8)[choice]
+        return np.hstack((types[:, None], rows))
+
+    def blocks(self, rows):
+        """
+        @brief Blocks
+
+        Collects the rows into blocks of at most blockHeight rows.
+
+        @param rows Iterable, which yields every row of the image as packed bytes.
+        """
+        block = []
+        for row in rows:
+            block.append(np.frombuffer(row, dtype=np.uint8))
+            if len(block) >= self.blockHeight:
+                yield np.vstack(block)
+                block = []
+
+        if len(block) > 0:
+            yield np.vstack(block)
+
+    def write(self, file, width, height, colorMode, rows):
+        """
+        @brief Write
+
+        Writes a PNG file with the vectorized filter stage and zlib.
+
+        @param file The binary file object the PNG is written to.
+        @param width The width of the image.
+        @param height The height of the image.
+        @param colorMode The color mode of the image.
+        @param rows Iterable, which yields every row of the image as packed bytes.
+        """
+        bitDepth = Encoder.bitDepth(colorMode)
+        colorType = 2 if colorMode == Color.Mode.RGB else 0
+        pixelSize = 3 if colorMode == Color.Mode.RGB else 1
+
+        file.write(Zlib.signature)
+        Zlib.writeChunk(file, b"IHDR", struct.pack("!2I5B", width, height, bitDepth, colorType, 0, 0, 0))
+
+        compressor = zlib.compressobj(self.level)
+        previous = None
+        data = b""
+
+        for block in self.blocks(rows):
+            if previous is None:
+                previous = np.zeros(block.shape[1], dtype=np.uint8)
+
+            data += compressor.compress(Zlib.filterBlock(block, previous, pixelSize, self.filter).tobytes())
+            previous = block[-1]
+
+            if len(data) > self.chunkLimit:
+                Zlib.writeChunk(file, b"IDAT", data)
+                data = b""
+
+        data += compressor.flush()
+        Zlib.writeChunk(file, b"IDAT", data)
+        Zlib.writeChunk(file, b"IEND", b"")
@@ -1,4 +1,4 @@
-import math
+import numpy as np
 
 from forms.Form import Form
 
@@ -13,7 +13,7 @@ class Circle(Form):
     """
 
     def __init__(self, size=40):
-       """
+        """
         @brief Constructor
 
         Constructs the form circle with a size of 40.
@@ -23,43 +23,94 @@ class Circle(Form):
         @author Philipp Koopke
         """
         Form.__init__(self, size)
-        self.__radius = size / 2
 
-    def setSize(self, size):
-    	"""
-        @brief setSize
+    @property
+    def radii(self):
+        """
+        @brief radii
 
-        Adjusts the size of the circle
+        return the horizontal and the vertical radius of the circle. Forms with different width and height are
+        ellipses.
+        """
+        return self.getWidth / 2, self.getHeight / 2
 
-        @param size the new size of the circle as int.
+    def offsets(self):
+        """
+        @brief offsets
 
-        @author Philipp Koopke
+        return the offsets of every pixel to the center of the circle as broadcastable arrays (y with the shape
+        (height, 1) and x with the shape (1, width))
         """
-        Form.setSize(self, size)
-        self.__radius = size / 2
+        y, x = self.grid()
+
+        # calculate the center of the circle
+        middleX = (self.getWidth / 2) - 0.5
+        middleY = (self.getHeight / 2) - 0.5
+
+        return y - middleY, x - middleX
+
+    def insideMask(self):
+        """
+        @brief insideMask
+
+        calculate the mask of all pixels in the circle. The squared distance to the center is compared to the
+        squared radius, an ellipse is tested by its implicit equation multiplied with both squared radii.
+        """
+        dy, dx = self.offsets()
+        radiusX, radiusY = self.radii
+
+        if radiusX == radiusY:
+            return dx * dx + dy * dy <= radiusX * radiusX
+
+        return dx * dx * (radiusY * radiusY) + dy * dy * (radiusX * radiusX) <= (radiusX * radiusX) * (radiusY * radiusY)
 
     def generate(self):
-    	"""
+        """
         @brief generate
 
         generate the form with the adjusted size
-        return a list of pixel which are in the circle   
+        return a list of pixel which are in the circle
 
         @author Philipp Koopke
         """
-        objList = []
+        return [(int(x), int(y), 1) for y, x in np.argwhere(self.insideMask())]
 
-	# calculate the center of the circle
-        middleX = (self.getWidth / 2) - 0.5
-        middleY = (self.getHeight / 2) - 0.5
+    def signedDistance(self):
+        """
+        @brief signedDistance
+
+        calculate the signed distance of every pixel to the border of the circle, negative inside of the circle.
+        The distance to the border of an ellipse is approximated by the implicit equation divided by its gradient.
+        """
+        dy, dx = self.offsets()
+        radiusX, radiusY = self.radii
+
+        if radiusX == radiusY:
+            return np.hypot(dx, dy) - radiusX
+
+        k0 = np.hypot(dx / radiusX, dy / radiusY)
+        k1 = np.hypot(dx / (radiusX * radiusX), dy / (radiusY * radiusY))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = k0 * (k0 - 1) / k1
 
-        for y in range(self.getHeight):
-            for x in range(self.getWidth):
-            	# calculate the distance from the current position to center of the circle
-                distance = math.sqrt(pow(middleY - y, 2) + pow(middleX - x, 2))
+        # the center has no gradient, its distance is the smaller radius
+        return np.where(k1 > 0, distance, -min(radiusX, radiusY))
 
-				# check if the position is in circle
-                if distance <= self.__radius:
-                    objList.append((x, y, 1))
+    def geometricDistance(self):
+        """
+        @brief geometricDistance
+
+        return the signed distance of the circle as the only distance of its only part
+        """
+        return [[self.signedDistance()]]
+
+    def rasterize(self):
+        """
+        @brief rasterize
+
+        rasterize the circle, with anti-aliasing the coverage is calculated from the signed distance
+        """
+        if self.antiAliasing:
+            return Form.coverage(self.signedDistance())
 
-        return objList
+        return self.insideMask()
@@ -22,12 +22,11 @@ class Cross(PolygonForm):
         """
         PolygonForm.__init__(self, size)
 
-    def generate(self):
+    def templates(self):
         """
-        @brief generate
+        @brief templates
 
-        generate the form with the adjusted size
-        return a list of pixel which are in the cross   
+        return the polygons of the cross
 
         @author Philipp Koopke
         """
@@ -39,4 +38,4 @@ class Cross(PolygonForm):
             [(1 - cornerDistance, 0), (1, cornerDistance), (cornerDistance, 1), (0, 1 - cornerDistance)]
         ]
 
-        return self.generateMultiplePolygons(coords)
+        return coords
@@ -1,3 +1,9 @@
+import numpy as np
+
+from forms.MaskCache import MaskCache
+from forms.Spans import Spans
+
+
 class Form:
     """
     @brief Form
@@ -7,20 +13,33 @@ class Form:
     @author Philipp Koopke
     """
 
+    # the larger side of the masks, that transformed forms and distance fields are sampled from
+    masterSize = 256
+
+    # the position of the sample of a pixel relative to its top left corner, 0 for polygons, which sample the
+    # corners of their pixels and 0.5 for forms, which sample the centers of their pixels
+    sampleOffset = 0.5
+
+    # resampled distances up to this distance in pixels of the master count as on the border, which absorbs the
+    # rounding errors of samples, that are exactly on an edge
+    distanceTolerance = 1e-9
+
     def __init__(self, size=40):
         """
         @brief Constructor
 
         Constructs the form with a size of 40.
 
-        @param size the size of the from as int.
+        @param size the size of the from as int or the width and height as tuple.
 
         @author Philipp Koopke
         """
-        self.__objWidth = size
-        self.__objHeight = size
+        self.__objWidth, self.__objHeight = Form.dimensions(size)
+        self.__transform = (0.0, 0.0)
+        self.__distanceField = False
         self.__enabled = True
         self.__renderBoundingBox = False
+        self.__antiAliasing = False
 
     @property
     def getWidth(self):
@@ -50,12 +69,410 @@ class Form:
 
         Adjusts the size of the form.
         
-        @param size the new size of the form as int.
+        @param size the new size of the form as int or the width and height as tuple.
 
         @author Philipp Koopke
         """
-        self.__objWidth = size
-        self.__objHeight = size
+        self.__objWidth, self.__objHeight = Form.dimensions(size)
+
+    @staticmethod
+    def dimensions(size):
+        """
+        @brief dimensions
+
+        return the width and the height of a size, which is either an int for squares or a tuple
+
+        @param size the size as int or the width and height as tuple
+        """
+        if isinstance(size, (tuple, list)):
+            return int(size[0]), int(size[1])
+
+        return size, size
+
+    @property
+    def transform(self):
+        """
+        @brief transform
+
+        return the rotation in degrees and the horizontal shear of the form
+        """
+        return self.__transform
+
+    def setTransform(self, rotation=0.0, shear=0.0):
+        """
+        @brief setTransform
+
+        Adjusts the transform of the form. The form is sheared and then rotated around its center, its mask
+        grows to the bounding box of the transformed form.
+
+        @param rotation the clockwise rotation in degrees
+        @param shear the horizontal shear, which moves every row by shear * its distance to the center
+        """
+        self.__transform = (float(rotation), float(shear))
+
+    @staticmethod
+    def transformMatrix(rotation, shear):
+        """
+        @brief transformMatrix
+
+        return the 2x2 matrix of a shear followed by a rotation, which maps (x, y) offsets from the center of
+        the form to offsets from the center of the mask
+
+        @param rotation the clockwise rotation in degrees, y points down
+        @param shear the horizontal shear
+        """
+        angle = np.radians(rotation)
+        rotate = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        return rotate @ np.array([[1.0, shear], [0.0, 1.0]])
+
+    @staticmethod
+    def transformedExtent(size, rotation, shear):
+        """
+        @brief transformedExtent
+
+        return the width and the height of the bounding box of a transformed form
+
+        @param size the size of the form as int or the width and height as tuple
+        @param rotation the clockwise rotation in degrees
+        @param shear the horizontal shear
+        """
+        width, height = Form.dimensions(size)
+        if rotation == 0 and shear == 0:
+            return width, height
+
+        corners = np.array([[-width, -height], [width, -height], [width, height], [-width, height]]) / 2
+        corners = corners @ Form.transformMatrix(rotation, shear).T
+        extent = np.ceil(corners.max(axis=0) - corners.min(axis=0) - 1e-9)
+        return max(1, int(extent[0])), max(1, int(extent[1]))
+
+    @staticmethod
+    def fitSize(size, aspect=1.0, rotation=0.0, shear=0.0):
+        """
+        @brief fitSize
+
+        return the largest width and height with the aspect ratio, whose transformed form fits into a square
+
+        @param size the side of the square as int
+        @param aspect the ratio of the height to the width of the form
+        @param rotation the clockwise rotation in degrees
+        @param shear the horizontal shear
+        """
+        scale = size
+        while True:
+            if aspect > 1:
+                dimensions = max(1, round(scale / aspect)), max(1, round(scale))
+            else:
+                dimensions = max(1, round(scale)), max(1, round(scale * aspect))
+
+            extent = Form.transformedExtent(dimensions, rotation, shear)
+            if max(extent) <= size or max(dimensions) == 1:
+                return dimensions
+
+            scale = min(scale - 1, scale * size / max(extent))
+
+    @property
+    def extent(self):
+        """
+        @brief extent
+
+        return the width and the height of the mask of the transformed form
+        """
+        return Form.transformedExtent((self.getWidth, self.getHeight), *self.__transform)
+
+    def rasterize(self):
+        """
+        @brief rasterize
+
+        Rasterizes the form with the adjusted size into a coverage mask. The default implementation
+        converts the pixel list of generate(), forms can overwrite it with a faster implementation.
+
+        @return Returns the coverage of every pixel as numpy array with the shape (height, width).
+        """
+        mask = np.zeros((self.getHeight, self.getWidth), dtype=np.float32)
+        pixels = self.generate()
+
+        if len(pixels) > 0:
+            pixels = np.asarray(pixels, dtype=np.float32)
+            mask[pixels[:, 1].astype(np.intp), pixels[:, 0].astype(np.intp)] = pixels[:, 2]
+
+        return mask
+
+    def grid(self):
+        """
+        @brief grid
+
+        Returns the coordinates of all pixels of the form as broadcastable arrays (y with the shape (height, 1)
+        and x with the shape (1, width)), so masks can be calculated with vectorized operations.
+        """
+        # np.ogrid builds the same arrays, but its index parsing costs more than the arrays of small forms
+        return np.arange(self.getHeight)[:, None], np.arange(self.getWidth)[None, :]
+
+    @staticmethod
+    def coverage(distance):
+        """
+        @brief coverage
+
+        Converts a signed distance in pixels (negative inside of the form) into the area of the pixel, that is
+        covered by the form. For horizontal and vertical edges this is the exact covered area of a pixel around
+        the sample. Diagonal edges, corners and curves are approximated by a linear ramp over one pixel.
+
+        @param distance the signed distance of every pixel as numpy array.
+        """
+        return np.clip(0.5 - distance, 0, 1).astype(np.float32)
+
+    def parameters(self):
+        """
+        @brief parameters
+
+        Returns the parameters, besides the size, that change the mask of the form. Forms with additional
+        parameters have to overwrite it, so their masks are cached correctly.
+        """
+        return ()
+
+    def cacheKey(self):
+        """
+        @brief cacheKey
+
+        Returns the key of the mask of the form in the mask cache.
+        """
+        return type(self), self.getWidth, self.getHeight, self.antiAliasing, self.parameters()
+
+    def mask(self):
+        """
+        @brief mask
+
+        Returns the coverage mask of the form with the adjusted size, which can be composited into an image
+        with Image.blitMask. Masks are cached in the shared MaskCache and must not be modified.
+        """
+        if self.__transform == (0.0, 0.0):
+            if self.__distanceField:
+                return MaskCache.shared().get(self.cacheKey() + ("distance field",), self.resampleDistanceField)
+
+            return MaskCache.shared().get(self.cacheKey(), self.rasterize)
+
+        return MaskCache.shared().get(self.cacheKey() + (self.__transform,), self.rasterizeTransformed)
+
+    def masterSizes(self):
+        """
+        @brief masterSizes
+
+        return the width and the height of the master of the form, whose larger side is masterSize and which
+        has the aspect ratio of the form
+        """
+        scale = Form.masterSize / max(self.getWidth, self.getHeight)
+        return max(1, round(self.getWidth * scale)), max(1, round(self.getHeight * scale))
+
+    def masterMask(self):
+        """
+        @brief masterMask
+
+        return the boolean mask of the untransformed form in the size of the master. The master is cached like
+        any other mask.
+        """
+        width, height = self.getWidth, self.getHeight
+        transform = self.__transform
+        antiAliasing = self.antiAliasing
+        distanceField = self.__distanceField
+
+        self.setSize(self.masterSizes())
+        self.__transform = (0.0, 0.0)
+        self.antiAliasing = False
+        self.__distanceField = False
+        try:
+            master = self.mask()
+        finally:
+            self.setSize((width, height))
+            self.__transform = transform
+            self.antiAliasing = antiAliasing
+            self.__distanceField = distanceField
+
+        return master.toMask() if isinstance(master, Spans) else np.asarray(master) > 0
+
+    def rasterizeTransformed(self):
+        """
+        @brief rasterizeTransformed
+
+        Rasterizes the transformed form by inverse mapping the pixels of its mask into a cached master mask of
+        the untransformed form with the size masterSize. With anti-aliasing every pixel is sampled 4x4 times.
+
+        @return Returns the mask with the shape of the extent, a boolean mask or with anti-aliasing a coverage mask.
+        """
+        width, height = self.getWidth, self.getHeight
+        transform = self.__transform
+        antiAliasing = self.antiAliasing
+        master = self.masterMask()
+        masterHeight, masterWidth = master.shape
+
+        extentWidth, extentHeight = self.extent
+        samples = 4 if antiAliasing else 1
+        # the pixels are sampled at the same position as the untransformed form, the subpixels of anti-aliasing
+        # cover the area of one pixel around it
+        subpixels = (np.arange(samples) + 0.5) / samples - 0.5 + self.sampleOffset
+        y = ((np.arange(extentHeight)[:, None] + subpixels).reshape(-1, 1)) - extentHeight / 2
+        x = ((np.arange(extentWidth)[:, None] + subpixels).reshape(1, -1)) - extentWidth / 2
+
+        # map the samples back into the untransformed form and from there to the nearest sample of the master
+        inverse = np.linalg.inv(Form.transformMatrix(*transform))
+        nearest = 0.5 - self.sampleOffset
+        u = np.floor((inverse[0, 0] * x + inverse[0, 1] * y + width / 2) * (masterWidth / width) + nearest).astype(np.intp)
+        v = np.floor((inverse[1, 0] * x + inverse[1, 1] * y + height / 2) * (masterHeight / height) + nearest).astype(np.intp)
+
+        inside = (u >= 0) & (u < masterWidth) & (v >= 0) & (v < masterHeight)
+        mask = np.zeros(inside.shape, dtype=np.bool_)
+        mask[inside] = master[v[inside], u[inside]]
+
+        if samples == 1:
+            return mask
+
+        return mask.reshape(extentHeight, samples, extentWidth, samples).mean(axis=(1, 3)).astype(np.float32)
+
+    @staticmethod
+    def distanceTransform(mask):
+        """
+        @brief distanceTransform
+
+        calculate the exact euclidean distance of every pixel to the nearest covered pixel of a mask. The squared
+        distances are calculated separately for the columns and the rows, row by row to limit the memory.
+
+        @param mask is the boolean mask as numpy array with the shape (height, width)
+        """
+        height, width = mask.shape
+        if not mask.any():
+            return np.full(mask.shape, np.inf)
+
+        # squared distance to the nearest covered pixel in the same column
+        rows = np.arange(height)
+        columns = np.full(mask.shape, np.inf)
+        for y in range(height):
+            offsets = np.where(mask, (rows[:, None] - y) ** 2, np.inf)
+            columns[y] = offsets.min(axis=0)
+
+        # the nearest covered pixel of a row is the minimum over all columns plus the horizontal distance
+        horizontal = (np.arange(width)[:, None] - np.arange(width)[None, :]) ** 2
+        distance = np.empty(mask.shape)
+        for y in range(height):
+            distance[y] = (columns[y][None, :] + horizontal).min(axis=1)
+
+        return np.sqrt(distance)
+
+    @property
+    def distanceField(self):
+        """
+        @brief distanceField
+
+        return the status if the masks of the form are resampled from a signed distance field
+        """
+        return self.__distanceField
+
+    @distanceField.setter
+    def distanceField(self, value):
+        """
+        @brief distanceField
+
+        set the status if the masks of the form are resampled from a signed distance field
+
+        @param value is the new status
+        """
+        self.__distanceField = value
+
+    def geometricDistance(self):
+        """
+        @brief geometricDistance
+
+        return the signed distances of every pixel sample in pixels, negative inside, which are calculated from
+        the geometry of the form, or None, if the form has no geometric distance. They are returned as a list of
+        parts, the form is the union of its parts. Every part is a list of distances, whose maximum is the
+        distance of the part, like the distances to the lines through the edges of a convex polygon. Samples on
+        the border have a distance of 0, like they are covered by the mask.
+        """
+        return None
+
+    def distanceFieldKey(self):
+        """
+        @brief distanceFieldKey
+
+        return the key of the signed distance field in the mask cache. It starts with a tag, so it can't be
+        mistaken for the cache key of a mask.
+        """
+        masterWidth, masterHeight = self.masterSizes()
+        return "distance field", type(self), masterWidth, masterHeight, self.parameters()
+
+    def signedDistanceField(self):
+        """
+        @brief signedDistanceField
+
+        return the signed distance field of the form in pixels of the master, negative inside, with the shape
+        (parts, layers, height, width). The field is calculated once for every aspect ratio and cached.
+        """
+        return MaskCache.shared().get(self.distanceFieldKey(), self.rasterizeDistanceField)
+
+    def rasterizeDistanceField(self):
+        """
+        @brief rasterizeDistanceField
+
+        calculate the signed distance field at the samples of the master. Forms with a geometric distance store
+        every distance of every part as a layer, parts with less distances repeat their last one. The distances
+        to straight edges are linear, so they are resampled exactly. Otherwise the field has a single layer
+        calculated from the master mask, its border is halfway between a covered and an uncovered pixel, so
+        resampled masks can differ from the geometry by pixels within half a pixel of the master from the border.
+        """
+        width, height = self.getWidth, self.getHeight
+        self.setSize(self.masterSizes())
+        try:
+            distance = self.geometricDistance()
+        finally:
+            self.setSize((width, height))
+
+        if distance:
+            layers = max(len(part) for part in distance)
+            return np.stack([np.stack(part + part[-1:] * (layers - len(part))) for part in distance]).astype(np.float64)
+
+        master = self.masterMask()
+
+        # forms without covered or uncovered pixels are farther away than the diagonal of the master
+        limit = float(np.hypot(*master.shape)) + 1
+        outside = np.minimum(Form.distanceTransform(master), limit)
+        inside = np.minimum(Form.distanceTransform(~master), limit)
+        return np.where(master, 0.5 - inside, outside - 0.5)[None, None]
+
+    def resampleDistanceField(self):
+        """
+        @brief resampleDistanceField
+
+        Rasterizes the form by bilinear resampling of every layer of the signed distance field. The distance of a
+        part is the maximum of its layers and the distance of the form is the minimum of its parts. Without
+        anti-aliasing pixels with a distance of at most distanceTolerance are covered, so samples on a straight
+        edge are covered like in the geometric mask. With anti-aliasing the coverage is calculated from the
+        distance.
+
+        @return Returns a boolean mask or with anti-aliasing a coverage mask.
+        """
+        field = self.signedDistanceField()
+        masterHeight, masterWidth = field.shape[2:]
+        offset = self.sampleOffset
+
+        # position of every pixel sample in the master, samples beyond the last sample of the master are
+        # extrapolated from the last cell, which keeps straight edges exact
+        u = (np.arange(self.getWidth) + offset) * (masterWidth / self.getWidth) - offset
+        v = (np.arange(self.getHeight) + offset) * (masterHeight / self.getHeight) - offset
+
+        left = np.clip(np.floor(u).astype(np.intp), 0, max(0, masterWidth - 2))
+        top = np.clip(np.floor(v).astype(np.intp), 0, max(0, masterHeight - 2))
+        right = np.minimum(left + 1, masterWidth - 1)
+        bottom = np.minimum(top + 1, masterHeight - 1)
+        fx = (u - left)[None, :] if masterWidth > 1 else np.zeros((1, len(u)))
+        fy = (v - top)[:, None] if masterHeight > 1 else np.zeros((len(v), 1))
+
+        upper = field[:, :, top[:, None], left[None, :]] * (1 - fx) + field[:, :, top[:, None], right[None, :]] * fx
+        lower = field[:, :, bottom[:, None], left[None, :]] * (1 - fx) + field[:, :, bottom[:, None], right[None, :]] * fx
+        distance = np.min(np.max(upper * (1 - fy) + lower * fy, axis=1), axis=0)
+
+        if self.antiAliasing:
+            # the distances of the master are scaled to the pixels of the form
+            scale = np.sqrt((self.getWidth / masterWidth) * (self.getHeight / masterHeight))
+            return Form.coverage(distance * scale)
+
+        return distance <= Form.distanceTolerance
 
     def enable(self):
         """
@@ -77,6 +494,7 @@ class Form:
         """
         self.__enabled = False
 
+    @property
     def isEnabled(self):
         """
         @brief isEnabled
@@ -111,3 +529,22 @@ class Form:
         """
         self.__renderBoundingBox = value
 
+    @property
+    def antiAliasing(self):
+        """
+        @brief antiAliasing
+
+        return the status if the form is rasterized with anti-aliased edges
+        """
+        return self.__antiAliasing
+
+    @antiAliasing.setter
+    def antiAliasing(self, value):
+        """
+        @brief antiAliasing
+
+        set the status if the form is rasterized with anti-aliased edges
+
+        @param value is the new status if the form is rasterized with anti-aliased edges
+        """
+        self.__antiAliasing = value
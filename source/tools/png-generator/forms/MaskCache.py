@@ -0,0 +1,124 @@
+from collections import OrderedDict
+
+
+class MaskCache:
+    """
+    @brief MaskCache
+
+    Least recently used cache of rasterized form masks. The cache is limited by the memory of the stored masks,
+    if a new mask exceeds the limit, the least recently used masks are evicted. Masks, which are not cached, are
+    looked up in the optional memory mapped atlas before they are rasterized.
+    """
+
+    __shared = None
+
+    def __init__(self, memoryLimit=64 * 1024 * 1024):
+        """
+        @brief Constructor
+
+        Constructs an empty mask cache.
+
+        @param memoryLimit the maximum memory of all cached masks in bytes.
+        """
+        self.entries = OrderedDict()
+        self.memoryLimit = memoryLimit
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.atlas = None
+        self.atlasHits = 0
+
+    @staticmethod
+    def shared():
+        """
+        @brief shared
+
+        return the cache, that is shared by all forms
+        """
+        if MaskCache.__shared is None:
+            MaskCache.__shared = MaskCache()
+
+        return MaskCache.__shared
+
+    @staticmethod
+    def size(mask):
+        """
+        @brief size
+
+        return the memory of a mask in bytes
+
+        @param mask is the cached mask, either a numpy array or Spans
+        """
+        return mask.nbytes
+
+    def get(self, key, rasterize):
+        """
+        @brief get
+
+        return the cached mask of the key. On a miss the mask is taken from the atlas, masks of the atlas are
+        already shared by the memory map, so they are not stored. Otherwise the mask is rasterized and stored.
+
+        @param key is the cache key of the mask
+        @param rasterize is the function, which rasterizes the mask on a miss
+        """
+        mask = self.entries.get(key)
+        if mask is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return mask
+
+        if self.atlas is not None:
+            mask = self.atlas.get(key)
+            if mask is not None:
+                self.atlasHits += 1
+                return mask
+
+        self.misses += 1
+        mask = rasterize()
+        # cached masks are shared, so they must not be modified
+        mask.setflags(write=False)
+        self.put(key, mask)
+        return mask
+
+    def put(self, key, mask):
+        """
+        @brief put
+
+        store a mask and evict the least recently used masks, until the memory limit is kept
+
+        @param key is the cache key of the mask
+        @param mask is the mask
+        """
+        size = MaskCache.size(mask)
+        if size > self.memoryLimit:
+            return
+
+        if key in self.entries:
+            self.memory -= MaskCache.size(self.entries.pop(key))
+
+        while self.entries and self.memory + size > self.memoryLimit:
+            _, evicted = self.entries.popitem(last=False)
+            self.memory -= MaskCache.size(evicted)
+
+        self.entries[key] = mask
+        self.memory += size
+
+    def clear(self):
+        """
+        @brief clear
+
+        remove all masks and reset the counters
+        """
+        self.entries.clear()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.atlasHits = 0
+
+    def __str__(self):
+        """
+        @brief __str__
+
+        return the statistics of the cache
+        """
+        return f"MaskCache(masks: {len(self.entries)}, memory: {self.memory}/{self.memoryLimit}, hits: {self.hits}, atlas hits: {self.atlasHits}, misses: {self.misses})"
@@ -22,12 +22,11 @@ class Plus(PolygonForm):
         """
         PolygonForm.__init__(self, size)
 
-    def generate(self):
+    def templates(self):
         """
-        @brief generate
+        @brief templates
 
-        generate the form with the adjusted size
-        return a list of pixel which are in the plus   
+        return the polygons of the plus
 
         @author Philipp Koopke
         """
@@ -38,4 +37,4 @@ class Plus(PolygonForm):
             [(0.35, 0), (0.65, 0), (0.65, 1), (0.35, 1)]
         ]
 
-        return self.generateMultiplePolygons(coords)
+        return coords
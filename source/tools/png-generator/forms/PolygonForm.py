@@ -1,9 +1,14 @@
-from shapely.geometry import Point, Polygon
+from abc import ABC, abstractmethod
+
+import numpy as np
 
 from forms.Form import Form
+from forms.Spans import Spans
+from rasterizers.Numpy import Numpy
+from rasterizers.Rasterizer import Rasterizer
 
 
-class PolygonForm(Form):
+class PolygonForm(Form, ABC):
     """
     @brief PolygonForm
 
@@ -11,7 +16,13 @@ class PolygonForm(Form):
 
     @author Philipp Koopke
     """
-    
+
+    # backend, which rasterizes the polygons of all forms
+    rasterizer = Numpy()
+
+    # polygons are sampled at the top left corner of every pixel
+    sampleOffset = 0
+
     def __init__(self, size=40):
         """
         @brief Constructor
@@ -35,29 +46,7 @@ class PolygonForm(Form):
 
         @author Philipp Koopke
         """
-        objList = []
-        polys = []
-
-	# create a list of polygons from the coords
-        for template in templates:
-            coords = []
-            for p in template:
-                coords.append((p[0] * self.getWidth, p[1] * self.getHeight))
-
-            polys.append(Polygon(coords))
-
-
-        for y in range(self.getHeight):
-            for x in range(self.getWidth):
-                p = Point(x, y)
-                
-                # check if the point is in one of the polygons
-                inside = [int(p.intersects(poly)) for poly in polys]
-
-                if sum(inside) >= 1:
-                    objList.append((x, y, 1))
-
-        return objList
+        return [(int(x), int(y), 1) for y, x in np.argwhere(self.insideMask(templates))]
 
     def generatePolygon(self, template):
         """
@@ -72,3 +61,161 @@ class PolygonForm(Form):
         """
         return self.generateMultiplePolygons([template])
 
+    @abstractmethod
+    def templates(self):
+        """
+        @brief templates
+
+        return the polygons of the form as list of templates. Every template is a list of coords between 0 and 1.
+        """
+
+    def generate(self):
+        """
+        @brief generate
+
+        generate the form with the adjusted size
+        return a list of pixel which are in one of the polygons
+        """
+        return self.generateMultiplePolygons(self.templates())
+
+    def insideMask(self, templates):
+        """
+        @brief insideMask
+
+        rasterize the polygons with the active rasterizer backend. Borders count as inside.
+
+        @param templates is a list of polygons. The values must be between 0 and 1.
+        """
+        return PolygonForm.rasterizer.inside(templates, self.getWidth, self.getHeight)
+
+    @staticmethod
+    def isConvex(coords):
+        """
+        @brief isConvex
+
+        check if a polygon is convex
+
+        @param coords is the list of coords of the polygon
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        edges = np.roll(coords, -1, axis=0) - coords
+        turns = edges[:, 0] * np.roll(edges, -1, axis=0)[:, 1] - edges[:, 1] * np.roll(edges, -1, axis=0)[:, 0]
+        return bool(np.all(turns >= 0) or np.all(turns <= 0))
+
+    def signedDistance(self, templates):
+        """
+        @brief signedDistance
+
+        calculate the signed distance of every pixel to the border of the polygons, negative inside.
+        The distance of a convex polygon is the maximum of the distances to the lines through its edges,
+        the distance of several polygons is the minimum of their distances.
+
+        @param templates is a list of convex polygons. The values must be between 0 and 1.
+        """
+        distance = np.full((self.getHeight, self.getWidth), np.inf)
+
+        for template in templates:
+            edgeDistances = self.edgeDistances(template)
+            if len(edgeDistances) == 0:
+                continue
+
+            polygonDistance = np.full((self.getHeight, self.getWidth), -np.inf)
+            for edgeDistance in edgeDistances:
+                polygonDistance = np.maximum(polygonDistance, edgeDistance)
+
+            distance = np.minimum(distance, polygonDistance)
+
+        return distance
+
+    def edgeDistances(self, template):
+        """
+        @brief edgeDistances
+
+        calculate the signed distance of every pixel to the line through every edge of a polygon, negative on the
+        inner side. Polygons without area have no inner side and no distances.
+
+        @param template is a convex polygon. The values must be between 0 and 1.
+        """
+        y, x = self.grid()
+        coords = np.asarray(template, dtype=np.float64) * (self.getWidth, self.getHeight)
+        nextCoords = np.roll(coords, -1, axis=0)
+        area = np.sum(coords[:, 0] * nextCoords[:, 1] - nextCoords[:, 0] * coords[:, 1])
+        if area == 0:
+            return []
+
+        distances = []
+        for start, end in zip(coords, nextCoords):
+            edge = end - start
+            length = np.hypot(edge[0], edge[1])
+            if length == 0:
+                continue
+
+            # edge function, positive on the inner side of the edge
+            inside = (edge[0] * (y - start[1]) - edge[1] * (x - start[0])) * np.sign(area)
+            distances.append(-inside / length)
+
+        return distances
+
+    def geometricDistance(self):
+        """
+        @brief geometricDistance
+
+        return the distances to the edges of every polygon, if all of them are convex, otherwise None. Polygons
+        without area are skipped.
+        """
+        templates = self.templates()
+        if not all(PolygonForm.isConvex(template) for template in templates):
+            return None
+
+        parts = [self.edgeDistances(template) for template in templates]
+        return [part for part in parts if len(part) > 0] or None
+
+    @staticmethod
+    def isRectangle(coords):
+        """
+        @brief isRectangle
+
+        check if a polygon is a rectangle, whose edges are parallel to the axes
+
+        @param coords is the list of coords of the polygon
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if len(coords) != 4:
+            return False
+
+        edges = np.roll(coords, -1, axis=0) - coords
+        return bool(np.all((edges[:, 0] == 0) != (edges[:, 1] == 0)))
+
+    def rectangleSpans(self, templates):
+        """
+        @brief rectangleSpans
+
+        rasterize rectangles, whose edges are parallel to the axes, directly into spans. Every rectangle covers
+        the pixels of its bounding box, including its border.
+
+        @param templates is a list of rectangles. The values must be between 0 and 1.
+        """
+        boxes = []
+        for template in templates:
+            coords = Rasterizer.scale(template, self.getWidth, self.getHeight)
+            left, top, right, bottom = Rasterizer.bounds(coords, self.getWidth, self.getHeight)
+            if left <= right and top <= bottom:
+                boxes.append((top, bottom + 1, left, right + 1))
+
+        return Spans(boxes, (self.getHeight, self.getWidth))
+
+    def rasterize(self):
+        """
+        @brief rasterize
+
+        rasterize the polygons, with anti-aliasing the coverage is calculated from the edge functions of
+        convex polygons. Forms, which only consist of rectangles parallel to the axes, are rasterized into spans.
+        """
+        templates = self.templates()
+        if self.antiAliasing and all(PolygonForm.isConvex(template) for template in templates):
+            return Form.coverage(self.signedDistance(templates))
+
+        if all(PolygonForm.isRectangle(template) for template in templates):
+            return self.rectangleSpans(templates)
+
+        return self.insideMask(templates)
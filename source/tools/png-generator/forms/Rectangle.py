@@ -1,8 +1,9 @@
 from forms.Form import Form
+from forms.Spans import Spans
 
 
 class Rectangle(Form):
-	"""
+    """
     @brief Rectangle
 
     Generate the form rectangle.
@@ -11,7 +12,7 @@ class Rectangle(Form):
     """
     
     def __init__(self, size=40):
-    	"""
+        """
         @brief Constructor
 
         Constructs the form rectangle with a size of 40.
@@ -24,7 +25,7 @@ class Rectangle(Form):
         Form.__init__(self, size)
 
     def generate(self):
-    	"""
+        """
         @brief generate
 
         generate the form with the adjusted size
@@ -38,3 +39,11 @@ class Rectangle(Form):
                 objList.append((x, y, 1))
 
         return objList
+
+    def rasterize(self):
+        """
+        @brief rasterize
+
+        rasterize the rectangle as one solid box, the rectangle covers every pixel with and without anti-aliasing
+        """
+        return Spans.Solid(self.getWidth, self.getHeight)
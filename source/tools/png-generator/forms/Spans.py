@@ -0,0 +1,106 @@
+import numpy as np
+
+
+class Spans:
+    """
+    @brief Spans
+
+    Run-length representation of a boolean form mask. The covered pixels are stored as boxes of horizontal
+    runs [start;end) over the rows [top;bottom), rows with the same run share one box. Spans can be used
+    everywhere a boolean mask is used: they are cached by the MaskCache and composited by Image.blitMask with
+    one slice assignment per box.
+    """
+
+    dtype = np.dtype(np.bool_)
+
+    def __init__(self, boxes, shape):
+        """
+        @brief Constructor
+
+        Constructs the spans from boxes.
+
+        @param boxes the boxes as (top, bottom, start, end) rows, bottom and end are exclusive
+        @param shape the shape (height, width) of the mask
+        """
+        self.boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        self.shape = tuple(shape)
+
+    @staticmethod
+    def Solid(width, height):
+        """
+        @brief Solid
+
+        return the spans of a mask, that covers all pixels
+
+        @param width the width of the mask
+        @param height the height of the mask
+        """
+        return Spans([(0, height, 0, width)] if width > 0 and height > 0 else [], (height, width))
+
+    @property
+    def nbytes(self):
+        """
+        @brief nbytes
+
+        return the memory of the spans in bytes
+        """
+        return self.boxes.nbytes
+
+    def setflags(self, write=None):
+        """
+        @brief setflags
+
+        set the write flag of the boxes, like numpy.ndarray.setflags
+
+        @param write is the new write flag
+        """
+        self.boxes.setflags(write=write)
+
+    def __len__(self):
+        """
+        @brief __len__
+
+        return the count of boxes
+        """
+        return len(self.boxes)
+
+    def __getitem__(self, region):
+        """
+        @brief __getitem__
+
+        return the spans of a region of the mask, like slicing a numpy array
+
+        @param region is a tuple of a row and a column slice with a step of 1
+        """
+        rows, columns = region
+        top, bottom, _ = rows.indices(self.shape[0])
+        left, right, _ = columns.indices(self.shape[1])
+        bottom = max(top, bottom)
+        right = max(left, right)
+
+        boxes = self.boxes - (top, top, left, left)
+        boxes[:, 0:2] = np.clip(boxes[:, 0:2], 0, bottom - top)
+        boxes[:, 2:4] = np.clip(boxes[:, 2:4], 0, right - left)
+        boxes = boxes[(boxes[:, 0] < boxes[:, 1]) & (boxes[:, 2] < boxes[:, 3])]
+
+        return Spans(boxes, (bottom - top, right - left))
+
+    def toMask(self):
+        """
+        @brief toMask
+
+        return the spans as boolean mask
+        """
+        mask = np.zeros(self.shape, dtype=np.bool_)
+        for top, bottom, start, end in self.boxes.tolist():
+            mask[top:bottom, start:end] = True
+
+        return mask
+
+    def nonzero(self):
+        """
+        @brief nonzero
+
+        return the rows and columns of all covered pixels in row-major order, like numpy.nonzero
+        """
+        return np.nonzero(self.toMask())
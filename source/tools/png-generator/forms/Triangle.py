@@ -2,7 +2,7 @@ from forms.PolygonForm import PolygonForm
 
 
 class Triangle(PolygonForm):
-	"""
+    """
     @brief Triangle
 
     Generate the form triangle.
@@ -10,7 +10,7 @@ class Triangle(PolygonForm):
     @author Philipp Koopke
     """
     def __init__(self, size=40):
-    	"""
+        """
         @brief Constructor
 
         Constructs the form triangle with a size of 40.
@@ -22,15 +22,15 @@ class Triangle(PolygonForm):
         """
         PolygonForm.__init__(self, size)
 
-    def generate(self):
-    	"""
-        @brief generate
+    def templates(self):
+        """
+        @brief templates
 
-        generate the form with the adjusted size
+        return the polygon of the triangle
 
         @author Philipp Koopke
         """
         
         # define a polygon form
         coords = [(0.5, 0), (0, 1), (1, 1)]
-        return self.generatePolygon(coords)
+        return [coords]
@@ -0,0 +1,95 @@
+from fractions import Fraction
+
+import numpy as np
+
+from rasterizers.Rasterizer import Rasterizer
+
+
+class Numpy(Rasterizer):
+    """
+    @brief Numpy
+
+    Backend, which rasterizes the polygons with vectorized edge functions. It only depends on numpy.
+    """
+
+    name = "numpy"
+
+    @staticmethod
+    def orientation(start, end, x, y):
+        """
+        @brief Orientation
+
+        Calculates the exact sign of the edge function of every pixel: 1 left of the edge, -1 right of the edge
+        and 0 on the line through the edge. Results, which are too close to 0 for floating point numbers,
+        are recalculated with exact fractions.
+
+        @param start The first coord of the edge.
+        @param end The second coord of the edge.
+        @param x The x coords of the pixels with the shape (1, width).
+        @param y The y coords of the pixels with the shape (height, 1).
+
+        @return Returns the signs as int8 array with the shape (height, width).
+        """
+        left = (end[0] - start[0]) * (y - start[1])
+        right = (end[1] - start[1]) * (x - start[0])
+        value = left - right
+        sign = np.sign(value).astype(np.int8)
+
+        # with integer coords every term is exact, otherwise the sign of a single rounded product is still exact,
+        # so only the difference of two products can be wrong
+        if all(float(c).is_integer() for c in (start[0], start[1], end[0], end[1])):
+            return sign
+
+        uncertain = (np.abs(value) <= 1e-9 * (np.abs(left) + np.abs(right))) & (left != 0) & (right != 0)
+        for row, column in np.argwhere(uncertain):
+            px = Fraction(int(x[0, column]))
+            py = Fraction(int(y[row, 0]))
+            exact = (Fraction(end[0]) - Fraction(start[0])) * (py - Fraction(start[1])) \
+                - (Fraction(end[1]) - Fraction(start[1])) * (px - Fraction(start[0]))
+            sign[row, column] = (exact > 0) - (exact < 0)
+
+        return sign
+
+    def inside(self, templates, width, height):
+        """
+        @brief Inside
+
+        Rasterizes the polygons with vectorized edge functions. A pixel is inside, if it is on the border of a
+        polygon or if a ray from it crosses the border of the polygon an odd count of times. Borders count as
+        inside, like the intersects test of shapely.
+
+        @param templates The list of polygons. Every polygon is a list of coords between 0 and 1.
+        @param width The width of the form.
+        @param height The height of the form.
+
+        @return Returns the mask of all pixels inside of one of the polygons.
+        """
+        mask = np.zeros((height, width), dtype=np.bool_)
+
+        for template in templates:
+            coords = Rasterizer.scale(template, width, height)
+
+            # only the pixels in the bounding box of the polygon have to be tested
+            left, top, right, bottom = Rasterizer.bounds(coords, width, height)
+            if left > right or top > bottom:
+                continue
+
+            x = np.arange(left, right + 1)[None, :]
+            y = np.arange(top, bottom + 1)[:, None]
+            border = np.zeros((bottom - top + 1, right - left + 1), dtype=np.bool_)
+            crossings = np.zeros(border.shape, dtype=np.int32)
+
+            for start, end in zip(coords, np.roll(coords, -1, axis=0)):
+                orientation = Numpy.orientation(start, end, x, y)
+
+                border |= (orientation == 0) \
+                    & (x >= min(start[0], end[0])) & (x <= max(start[0], end[0])) \
+                    & (y >= min(start[1], end[1])) & (y <= max(start[1], end[1]))
+
+                upward = (start[1] <= y) & (y < end[1])
+                downward = (end[1] <= y) & (y < start[1])
+                crossings += (upward & (orientation > 0)) | (downward & (orientation < 0))
+
+            mask[top:bottom + 1, left:right + 1] |= border | (crossings % 2 == 1)
+
+        return mask
@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Rasterizer(ABC):
+    """
+    @brief Rasterizer
+
+    Base class for all polygon rasterizer backends. A backend decides for every pixel of a form, if it is
+    inside of one of the polygons of the form. Pixels on the border of a polygon count as inside.
+    """
+
+    name = None
+
+    @staticmethod
+    def available():
+        """
+        @brief Available
+
+        @return Returns True, if the backend can be used with the installed packages.
+        """
+        return True
+
+    @staticmethod
+    def scale(template, width, height):
+        """
+        @brief Scale
+
+        Scales a polygon template to the size of the form.
+
+        @param template The list of coords of the polygon. The values must be between 0 and 1.
+        @param width The width of the form.
+        @param height The height of the form.
+
+        @return Returns the coords of the polygon in pixels as array with the shape (coords, 2).
+        """
+        return np.asarray(template, dtype=np.float64) * (width, height)
+
+    @staticmethod
+    def bounds(coords, width, height):
+        """
+        @brief Bounds
+
+        Calculates the pixels, that are in the bounding box of a polygon.
+
+        @param coords The coords of the polygon in pixels.
+        @param width The width of the form.
+        @param height The height of the form.
+
+        @return Returns the tuple (left, top, right, bottom) of inclusive pixel coords. The bounding box is empty,
+        if left > right or top > bottom.
+        """
+        left = max(0, int(np.ceil(coords[:, 0].min())))
+        right = min(width - 1, int(np.floor(coords[:, 0].max())))
+        top = max(0, int(np.ceil(coords[:, 1].min())))
+        bottom = min(height - 1, int(np.floor(coords[:, 1].max())))
+        return left, top, right, bottom
+
+    @abstractmethod
+    def inside(self, templates, width, height):
+        """
+        @brief Inside
+
+        Rasterizes the polygons.
+
+        @param templates The list of polygons. Every polygon is a list of coords between 0 and 1.
+        @param width The width of the form.
+        @param height The height of the form.
+
+        @return Returns the mask of all pixels inside of one of the polygons as bool array with the shape
+        (height, width).
+        """
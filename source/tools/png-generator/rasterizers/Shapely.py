@@ -0,0 +1,53 @@
+from importlib.util import find_spec
+
+import numpy as np
+
+from rasterizers.Rasterizer import Rasterizer
+
+
+class Shapely(Rasterizer):
+    """
+    @brief Shapely
+
+    Reference backend, which tests every single pixel with the intersects test of shapely.
+    """
+
+    name = "shapely"
+
+    @staticmethod
+    def available():
+        """
+        @brief Available
+
+        @return Returns True, if shapely is installed.
+        """
+        return find_spec("shapely") is not None
+
+    def inside(self, templates, width, height):
+        """
+        @brief Inside
+
+        Rasterizes the polygons pixel by pixel.
+
+        @param templates The list of polygons. Every polygon is a list of coords between 0 and 1.
+        @param width The width of the form.
+        @param height The height of the form.
+
+        @return Returns the mask of all pixels inside of one of the polygons.
+        """
+        # shapely is only imported, when the backend is used
+        from shapely.geometry import Point, Polygon
+
+        mask = np.zeros((height, width), dtype=np.bool_)
+
+        # create a list of polygons from the coords
+        polys = [Polygon(Rasterizer.scale(template, width, height)) for template in templates]
+
+        for y in range(height):
+            for x in range(width):
+                p = Point(x, y)
+
+                # check if the point is in one of the polygons
+                mask[y, x] = any(p.intersects(poly) for poly in polys)
+
+        return mask
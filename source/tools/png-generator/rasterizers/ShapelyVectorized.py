@@ -0,0 +1,61 @@
+from importlib.util import find_spec
+
+import numpy as np
+
+from rasterizers.Rasterizer import Rasterizer
+
+
+class ShapelyVectorized(Rasterizer):
+    """
+    @brief Shapely Vectorized
+
+    Backend, which tests all pixels in the bounding box of a polygon with one call of the vectorized
+    intersects_xy predicate of shapely 2.
+    """
+
+    name = "shapely-vectorized"
+
+    @staticmethod
+    def available():
+        """
+        @brief Available
+
+        @return Returns True, if shapely 2 or newer is installed.
+        """
+        if find_spec("shapely") is None:
+            return False
+
+        import shapely
+        return hasattr(shapely, "intersects_xy")
+
+    def inside(self, templates, width, height):
+        """
+        @brief Inside
+
+        Rasterizes the polygons with prepared geometries and the vectorized intersects predicate.
+
+        @param templates The list of polygons. Every polygon is a list of coords between 0 and 1.
+        @param width The width of the form.
+        @param height The height of the form.
+
+        @return Returns the mask of all pixels inside of one of the polygons.
+        """
+        # shapely is only imported, when the backend is used
+        import shapely
+        from shapely.geometry import Polygon
+
+        mask = np.zeros((height, width), dtype=np.bool_)
+
+        for template in templates:
+            coords = Rasterizer.scale(template, width, height)
+            left, top, right, bottom = Rasterizer.bounds(coords, width, height)
+            if left > right or top > bottom:
+                continue
+
+            polygon = Polygon(coords)
+            shapely.prepare(polygon)
+
+            y, x = np.mgrid[top:bottom + 1, left:right + 1]
+            mask[top:bottom + 1, left:right + 1] |= shapely.intersects_xy(polygon, x.astype(np.float64), y.astype(np.float64))
+
+        return mask